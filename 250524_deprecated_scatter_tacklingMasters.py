@@ -1,14 +1,14 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
-import matplotlib.patheffects as path_effects
 import scipy.stats as stats
-import soccerdata as sd
 import urllib.request
 import os
 
 from _commons import addTitleSubAndLogo
-from adjustText import adjust_text
+from _fbref_commons import read_player_table
+from _label_placement import place_labels
+from _metrics import add_metrics
+from _teams import league_logo_url
 from PIL import Image
 
 # Initialization
@@ -17,24 +17,18 @@ outputFolder = os.path.join("imgs/", str(f"scatterplot"))
 os.makedirs(outputFolder, exist_ok=True)
 
 # Data
-fbref = sd.FBref(leagues="ITA-Serie B", seasons=2024)
-df = fbref.read_player_season_stats(stat_type="defense")
-df = df.reset_index()
-if isinstance(df.columns, pd.MultiIndex):
-    df.columns = ["_".join(col).strip("_") for col in df.columns.values]
-
-df["tkl90"] = df["Tackles_Tkl"] / df["90s"]
-df["tklW90"] = df["Tackles_TklW"] / df["90s"]
-df["tklW%"] = (df["tklW90"] / df["tkl90"]).round(2)
+df = read_player_table(
+    "ITA-Serie B", 2024, columns=["pos", "90s", "tackles_tkl", "tackles_tklw"]
+)
+df = add_metrics(df, ["tkl90", "tklw90", "tklw_share"])
+df["tklW%"] = df["tklw_share"].round(2)
 
 df = df[(df["90s"] >= df["90s"].median()) & (df["tkl90"] >= df["tkl90"].median())]
-df = df[["team", "player", "pos", "90s", "tkl90", "tklW90", "tklW%"]]
+df = df[["team", "player", "pos", "90s", "tkl90", "tklw90", "tklW%"]]
 df = df.sort_values(by="tkl90", ascending=False)
 df = df.reset_index(drop=True)
 df["zscore"] = stats.zscore(df["tkl90"]) * 0.5 + stats.zscore(df["tklW%"]) * 0.5
-df["annotated"] = [
-    True if x > df["zscore"].quantile(0.85) else False for x in df["zscore"]
-]
+df["annotated"] = df["zscore"] > df["zscore"].quantile(0.85)
 
 # Visual
 fig = plt.figure(
@@ -61,28 +55,17 @@ ax.scatter(
     alpha=0.8,
 )
 
-texts = []
-annotated = df[df["annotated"]].reset_index(drop=True)
-for index in range(annotated.shape[0]):
-    texts += [
-        ax.text(
-            x=annotated["tkl90"].iloc[index],
-            y=annotated["tklW%"].iloc[index],
-            s=f"{annotated['player'].iloc[index]}",
-            path_effects=[
-                path_effects.Stroke(linewidth=2, foreground=fig.get_facecolor()),
-                path_effects.Normal(),
-            ],
-            color="black",
-            weight="bold",
-            size=8,
-        )
-    ]
-
-adjust_text(
-    texts,
-    only_move={"static": "y"},
-    arrowprops=dict(arrowstyle="-", color="gray", lw=0.5),
+annotated = df[df["annotated"]].sort_values("zscore", ascending=False)
+place_labels(
+    ax,
+    annotated["tkl90"],
+    annotated["tklW%"],
+    annotated["player"],
+    fontsize=8,
+    fontweight="bold",
+    stroke=(2, fig.get_facecolor()),
+    marker_size=55,
+    obstacles=(df["tkl90"], df["tklW%"]),
 )
 
 addTitleSubAndLogo(
@@ -96,7 +79,7 @@ addTitleSubAndLogo(
     subtitleLineSpacing=1.5,
     spacing=0.02,
     source="Data: FBRef | @francescozonaro",
-    logo="https://images.fotmob.com/image_resources/logo/leaguelogo/86.png",
+    logo=league_logo_url("ITA-Serie B"),
 )
 
 plt.savefig(
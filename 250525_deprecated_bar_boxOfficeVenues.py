@@ -9,6 +9,8 @@ import urllib.request
 from PIL import Image
 from highlight_text import fig_text
 from matplotlib.colors import LinearSegmentedColormap
+from _teams import league_logo_url
+from _venues import current_venues, venue_history, venue_matches, venue_stats
 
 # Initialization
 plt.rcParams["font.family"] = "Monospace"
@@ -29,24 +31,10 @@ df = df.reset_index()
 if isinstance(df.columns, pd.MultiIndex):
     df.columns = ["_".join(col).strip("_") for col in df.columns.values]
 
-df = df[df["venue"].notna() & df["score"].notna()]
-df[["home_goals", "away_goals"]] = (
-    df["score"]
-    .str.replace("[–—−]", "-", regex=True)
-    .str.split("-", expand=True)
-    .astype(int)
-)
-df["total_goals"] = df["home_goals"] + df["away_goals"]
-latestVenues = df.groupby("home_team")["venue"].last().to_dict()
-df = (
-    df.groupby("home_team")
-    .agg(
-        total_goals=("total_goals", "sum"),
-        games_counted=("game_id", "count"),
-    )
-    .reset_index()
-)
-df["goals90"] = df["total_goals"] / df["games_counted"]
+matches = venue_matches(df)
+latestVenues = current_venues(venue_history(matches))
+df = venue_stats(matches, keys=["home_team"])
+df["goals90"] = df["goals_per_game"]
 df["venue"] = df["home_team"].map(latestVenues)
 df = df.sort_values(by="goals90", ascending=True).reset_index(drop=True)
 
@@ -90,7 +78,7 @@ for i, (team, venue, val) in enumerate(
         zorder=4,
     )
 
-league_logo = "https://images.fotmob.com/image_resources/logo/leaguelogo/47.png"
+league_logo = league_logo_url("ENG-Premier League")
 league_icon = Image.open(urllib.request.urlopen(league_logo)).convert("LA")
 logo_ax = fig.add_axes([0.8, 0.975, 0.075, 0.075], anchor="C")
 logo_ax.imshow(league_icon)
@@ -6,24 +6,8 @@ import numpy as np
 import urllib.request
 
 from PIL import Image
-from scipy.stats import poisson
 from _commons import addTitleSubAndLogo
-
-
-def calculateXpts(home_xg, away_xg, max_goals=5):
-    home_probs = poisson.pmf(range(0, max_goals + 1), home_xg)
-    away_probs = poisson.pmf(range(0, max_goals + 1), away_xg)
-
-    match_probs = np.outer(home_probs, away_probs)
-    p_home_win = np.sum(np.tril(match_probs, -1))
-    p_draw = np.sum(np.diag(match_probs))
-    p_away_win = np.sum(np.triu(match_probs, 1))
-
-    home_xpts = (3 * p_home_win) + (1 * p_draw)
-    away_xpts = (3 * p_away_win) + (1 * p_draw)
-
-    return home_xpts, away_xpts
-
+from _fbref_commons import calculate_xpts
 
 # Initialization
 plt.rcParams["font.family"] = "Monospace"
@@ -51,6 +35,7 @@ df[["home_goals", "away_goals"]] = (
     .str.split("-", expand=True)
     .astype(int)
 )
+df["home_xpts"], df["away_xpts"] = calculate_xpts(df["home_xg"], df["away_xg"])
 
 
 teams = ["Inter", "Napoli"]
@@ -59,9 +44,8 @@ runningTotals = {team: {"actual": 0, "expected": 0} for team in teams}
 
 for _, row in df.iterrows():
     homeTeam, awayTeam = row["home_team"], row["away_team"]
-    home_xg, away_xg = row["home_xg"], row["away_xg"]
     homeGoals, awayGoals = row["home_goals"], row["away_goals"]
-    home_xpts, away_xpts = calculateXpts(home_xg, away_xg)
+    home_xpts, away_xpts = row["home_xpts"], row["away_xpts"]
 
     if homeGoals > awayGoals:
         homePts, awayPts = 3, 0
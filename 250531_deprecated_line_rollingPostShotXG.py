@@ -2,7 +2,6 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patheffects as path_effects
 import soccerdata as sd
-import matplotlib.colors as mcolors
 import os
 import urllib.request
 import numpy as np
@@ -10,13 +9,15 @@ import datetime
 
 from PIL import Image
 from _commons import (
+    add_gap_shading,
     addTitleSubAndLogo,
     initPlotting,
     initFolders,
     flattenMultiCol,
     justifyText,
 )
-
+from _players import same_player
+from _teams import league_logo_url
 
 # Initialization
 initPlotting()
@@ -61,7 +62,7 @@ if not os.path.exists(DATA_CACHING_PATH):
             print(f"Failed to get stats for match {gameId}: {e}")
             continue
 
-        gkMatchRows = mdf[mdf["player"] == PLAYER_NAME]
+        gkMatchRows = mdf[same_player(mdf["player"], PLAYER_NAME)]
         df.append(gkMatchRows)
 
     df = pd.concat(df, ignore_index=True)
@@ -118,40 +119,17 @@ ax.plot(
     linewidth=1.25,
 )
 
-
-def highlightColor(base_color, blend_color, diff, vmin, vmax):
-    """
-    Returns a color close to base_color when |diff| is large,
-    and closer to blend_color when diff is near zero.
-    """
-    mag = abs(diff) / max(abs(vmin), abs(vmax)) if vmax != 0 or vmin != 0 else 0
-    mag = 0.65 + 0.35 * mag
-
-    # Interpolate from blend_color (when mag=0) to base_color (when mag=1)
-    c_base = np.array(mcolors.to_rgb(base_color))
-    c_blend = np.array(mcolors.to_rgb(blend_color))
-    rgb = mag * c_base + (1 - mag) * c_blend
-    return mcolors.to_hex(rgb)
-
-
-vmin = df["diff_rolling"].min()
-vmax = df["diff_rolling"].max()
-for i in range(1, len(df["game"])):
-    diff = df["diff_rolling"].iloc[i]
-    if diff > 0:
-        color = highlightColor("#386641", "#c1121f", diff, vmin, vmax)
-    else:
-        color = highlightColor("#c1121f", "#386641", diff, vmin, vmax)
-
-    ax.fill_between(
-        [i - 1, i],
-        [df["psxg_rolling"].iloc[i - 1], df["psxg_rolling"].iloc[i]],
-        [df["ga_rolling"].iloc[i - 1], df["ga_rolling"].iloc[i]],
-        color=color,
-        zorder=3,
-        alpha=0.5,
-        linewidth=0.1,
-    )
+add_gap_shading(
+    ax,
+    df.index,
+    df["psxg_rolling"],
+    df["ga_rolling"],
+    pos_color="#386641",
+    neg_color="#c1121f",
+    zorder=3,
+    alpha=0.5,
+    linewidth=0.1,
+)
 
 ax.legend(markerscale=2, loc="upper left", fontsize="x-small", frameon=False)
 
@@ -224,7 +202,7 @@ addTitleSubAndLogo(
     subtitleLineSpacing=1.5,
     spacing=0.03,
     source="Data: FBRef | @francescozonaro",
-    logo="https://images.fotmob.com/image_resources/logo/leaguelogo/87.png",
+    logo=league_logo_url("ESP-La Liga"),
 )
 
 plt.savefig(
@@ -1,96 +1,33 @@
-import matplotlib.pyplot as plt
-import matplotlib.patheffects as path_effects
-import matplotlib.colors as mcolors
-
-import os
-import soccerdata as sd
-import pandas as pd
-import urllib.request
-
-from _commons import flattenMultiCol
-from adjustText import adjust_text
-from PIL import Image
-from matplotlib.colors import LinearSegmentedColormap
-
+from _fbref_commons import player_table_path, read_player_table
+from _metrics import add_metrics, metric_inputs
+from _team_bars import render_team_bars
+from _teams import league_fotmob_ids
 
 IMAGE_SUB_FOLDER = "biel"
-VISUAL_NAME = "250808_bar_wastedCreators_charlotte"
-FBREF_FOLDER = "fbrefData"
-CACHE_PATH = f"{FBREF_FOLDER}/{VISUAL_NAME}.pkl"
+VISUAL_NAME = "250808_bar_wastedCreators"
+LEAGUE = "USA-Major League Soccer"
+SEASON = 2025
 OUTPUT_FOLDER = f"imgs/{IMAGE_SUB_FOLDER}"
-
-plt.rcParams["font.family"] = "Monospace"
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-os.makedirs(FBREF_FOLDER, exist_ok=True)
-
-if not os.path.exists(CACHE_PATH):
-    fbref = sd.FBref(leagues="USA-Major League Soccer", seasons=2025)
-    df = fbref.read_player_season_stats(stat_type="passing").reset_index()
-    df.columns = flattenMultiCol(df.columns)
-    df.to_pickle(CACHE_PATH)
-else:
-    df = pd.read_pickle(CACHE_PATH)
-
-
-# df = df[df["90s"] > 10].reset_index(drop=True)
-df = df[df["team"] == "Charlotte"]
-df = df[df["expected_xa"] != 0]
-df = df.nlargest(30, "expected_xa").reset_index(drop=True)
-df["target"] = df["ast"] - df["expected_xa"]
-df = df.sort_values(by="target", ascending=False).reset_index(drop=True)
-
-fig = plt.figure(figsize=(7, 9), dpi=600)
-ax = plt.subplot()
-ax.set_facecolor("#eeeeee")
-ax.grid(visible=True, ls="--", color="lightgrey")
-ax.spines["right"].set_visible(False)
-ax.spines["top"].set_visible(False)
-ax.set_xlabel("Assists - xAssists", labelpad=10)
-
-colors = ["#C2B7B7", "#288ece"]
-custom_cmap = LinearSegmentedColormap.from_list("custom_gradient", colors)
-norm = mcolors.Normalize(vmin=df["target"].min(), vmax=df["target"].max())
-
-ax.barh(
-    df.index,
-    df["target"],
-    zorder=3,
-    color=custom_cmap(norm(df["target"])),
-)
-
-for i, (player, val) in enumerate(zip(df["player"], df["target"])):
-
-    label = f"{player}"
-    xval = 0.2 if val > 0 else -0.2
-    haval = "left" if val > 0 else "right"
-
-    ax.text(
-        xval,
-        i,
-        label,
-        va="center",
-        ha=haval,
-        fontsize=9,
-        zorder=4,
-        fontweight="bold",
-        path_effects=[path_effects.withStroke(linewidth=1, foreground="white")],
-    )
-
-ax.spines["left"].set_position(("data", 0))
-ax.set_xticks(range(-5, 6, 1))
-ax.set_yticks([])
-
-league_logo = "https://images.fotmob.com/image_resources/logo/teamlogo/1323940.png"
-league_icon = Image.open(urllib.request.urlopen(league_logo))  # .convert("LA")
-logo_ax = fig.add_axes([0.4825, 0.9, 0.06, 0.06], anchor="C")
-logo_ax.imshow(league_icon)
-logo_ax.axis("off")
-
-plt.savefig(
-    f"{OUTPUT_FOLDER}/{VISUAL_NAME}.png",
-    facecolor="#eeeeee",
-    bbox_inches="tight",
-    pad_inches=0.3,
-    edgecolor="none",
-    transparent=False,
+TARGET_METRIC = "ast_minus_xa"
+TARGET_TEAMS = ["Charlotte"]  # None renders every registered team of the league
+TEAM_FOTMOB_IDS = league_fotmob_ids(LEAGUE)  # only registered teams have a logo
+PROCESSES = 0  # 0 renders in this process, None uses one worker per CPU
+
+df = read_player_table(LEAGUE, SEASON, columns=metric_inputs(TARGET_METRIC))
+df = add_metrics(df, [TARGET_METRIC])
+
+render_team_bars(
+    df,
+    TARGET_METRIC,
+    base_col="expected_xa",
+    output_template=f"{OUTPUT_FOLDER}/{VISUAL_NAME}_{{team}}.png",
+    teams=TARGET_TEAMS or list(TEAM_FOTMOB_IDS),
+    top=30,
+    team_to_fotmob_id=TEAM_FOTMOB_IDS,
+    processes=PROCESSES,
+    inputs={"table": player_table_path(LEAGUE, SEASON)},
+    xlabel="Assists - xAssists",
+    min_bound=5,
+    fontsize=9,
+    logo_x=0.4825,
 )
@@ -1,9 +1,9 @@
-import matplotlib.pyplot as plt
 import os
-import soccerdata as sd
 import pandas as pd
 
-from _commons import flattenMultiCol
+from _fbref_commons import fbref_client, flattenMultiCol, read_lineup_table
+from _players import same_player
+from _store import write_table
 
 
 IMAGE_SUB_FOLDER = "biel"
@@ -12,14 +12,14 @@ FBREF_FOLDER = "fbrefData"
 CACHE_PATH = f"{FBREF_FOLDER}/{VISUAL_NAME}.pkl"
 OUTPUT_FOLDER = f"imgs/{IMAGE_SUB_FOLDER}"
 
-plt.rcParams["font.family"] = "Monospace"
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 os.makedirs(FBREF_FOLDER, exist_ok=True)
 
-fbref = sd.FBref(leagues="USA-Major League Soccer", seasons=2025)
 if not os.path.exists(CACHE_PATH):
+    fbref = fbref_client("USA-Major League Soccer", seasons=2025)
     df = fbref.read_schedule().reset_index()
     df.columns = flattenMultiCol(df.columns)
+    write_table(df, "schedule")
     df.to_pickle(CACHE_PATH)
 else:
     df = pd.read_pickle(CACHE_PATH)
@@ -28,21 +28,21 @@ TARGET_TEAM = "Seattle Sounders"
 team_df = df[(df["home_team"] == TARGET_TEAM) | (df["away_team"] == TARGET_TEAM)]
 
 
-def checkifPlayerIsStarter(row, player_name):
-    game_id = row["game_id"]
-    lineup = fbref.read_lineup(match_id=game_id)
-    filteredLineup = lineup.loc[lineup["player"] == player_name, "is_starter"]
+PLAYER_NAME = "Yeimar Gómez Andrade"
+lineups = read_lineup_table(
+    "USA-Major League Soccer", 2025, match_ids=team_df["game_id"]
+)
+starts = lineups[same_player(lineups["player"], PLAYER_NAME)]
+starts = starts.drop_duplicates("game").set_index("game")["is_starter"].to_dict()
 
-    if not filteredLineup.empty:
-        isStarter = filteredLineup.iloc[0]
-    else:
-        isStarter = False
 
-    return isStarter
+def checkifPlayerIsStarter(row, starts):
+    # A lookup, not a fetch: the lineups were read once above.
+    return starts.get(row["game"], False)
 
 
 team_df["playerIsStarter"] = team_df.apply(
-    lambda row: checkifPlayerIsStarter(row, player_name="Yeimar Gómez Andrade"), axis=1
-)
+    lambda row: checkifPlayerIsStarter(row, starts), axis=1
+).astype("boolean")
 
 print(team_df)
@@ -1,29 +1,20 @@
-import soccerdata as sd
 import numpy as np
 import pandas as pd
 import os
-import matplotlib.pyplot as plt
-import matplotlib.patheffects as path_effects
-import matplotlib.colors as mcolors
+import sys
 
 from datetime import datetime
 from collections import defaultdict
-from _commons import flattenMultiCol
+from _render_cache import visual_fingerprint, is_up_to_date, record_render
+from _sorare import fixture_pairings
+from _store import write_table
 from _fbref_commons import (
+    fbref_client,
+    flattenMultiCol,
     separate_score,
     filter_regular_season,
-    normalize_fbref_schedule,
 )
 
-
-# Functions
-def isEasyMatch(team_row, mode, offStrong, offWeak, defStrong, defWeak):
-    if mode == "DEF":
-        return team_row["team"] in defStrong and team_row["opponent"] in offWeak
-    else:
-        return team_row["team"] in offStrong and team_row["opponent"] in defWeak
-
-
 # Init
 FBREF_FOLDER = "fbrefData"
 TARGET_LEAGUE = "BEL-Belgian Pro League"
@@ -31,8 +22,8 @@ TODAY = datetime.today().strftime("%Y%m%d")
 VISUAL_NAME = f"{TODAY}_{TARGET_LEAGUE}_sorareFixtureCorrelation"
 CACHE_PATH = f"{FBREF_FOLDER}/{VISUAL_NAME}.pkl"
 OUTPUT_FOLDER = f"imgs/{TARGET_LEAGUE}"
+OUTPUT_PATH = f"{OUTPUT_FOLDER}/{VISUAL_NAME}.png"
 
-plt.rcParams["font.family"] = "Monospace"
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 os.makedirs(FBREF_FOLDER, exist_ok=True)
 
@@ -43,14 +34,11 @@ PREV_SEASON = "2425"
 CUR_SEASON = "2526"
 USE_CUSTOM_INPUTS = True
 
-fbref = sd.FBref(
-    leagues=TARGET_LEAGUE,
-    seasons=[PREV_SEASON, CUR_SEASON],
-)
-
 if not os.path.exists(CACHE_PATH):
+    fbref = fbref_client(TARGET_LEAGUE, seasons=[PREV_SEASON, CUR_SEASON])
     df = fbref.read_schedule().reset_index()
     df.columns = flattenMultiCol(df.columns)
+    write_table(df, "schedule")
     df.to_pickle(CACHE_PATH)
 else:
     df = pd.read_pickle(CACHE_PATH)
@@ -153,38 +141,12 @@ else:
     defStrong = [t for t, v in teamScores.items() if v["defScore"] <= defThreshold]
     defWeak = [t for t, v in teamScores.items() if v["defScore"] >= defOppThreshold]
 
-home_cols = {
-    "home_team": "team",
-    "away_team": "opponent",
-}
-away_cols = {
-    "home_team": "opponent",
-    "away_team": "team",
-}
-df_norm = normalize_fbref_schedule(df_future, home_cols, away_cols)
-
 # Note that every team is processed offensively even without explicitly iterating on the "OFF" target mode
 res = {}
 maxBestPairings = 0
-target_mode = "DEF"
-opposite_mode = "OFF"
-
-df_norm["easy_DEF"] = df_norm.apply(
-    lambda r: isEasyMatch(r, target_mode, offStrong, offWeak, defStrong, defWeak),
-    axis=1,
+counts = fixture_pairings(
+    df_future, offStrong, offWeak, defStrong, defWeak, target_mode="DEF"
 )
-df_norm["easy_OFF"] = df_norm.apply(
-    lambda r: isEasyMatch(r, opposite_mode, offStrong, offWeak, defStrong, defWeak),
-    axis=1,
-)
-
-easy_target = df_norm[df_norm[f"easy_{target_mode}"]].copy()
-easy_opposite = df_norm[df_norm[f"easy_{opposite_mode}"]].copy()
-
-merged = easy_target.merge(easy_opposite, on="week", suffixes=("_tgt", "_opp"))
-merged = merged[merged["team_tgt"] != merged["team_opp"]]
-
-counts = merged.groupby(["team_tgt", "team_opp"]).size().reset_index(name="Count")
 
 for team in teams_current_season:
     df_res_team = counts[counts["team_tgt"] == team].sort_values(
@@ -196,81 +158,39 @@ for team in teams_current_season:
         if highest_count >= MIN_GOOD_GWS_NUMBER:
             res[team] = df_res_team.rename(columns={"team_opp": "Team"})
 
-rows = int(round(len(res) / 2))
-
-fig, axs = plt.subplots(rows, 2, figsize=(12, 16), sharex=True, dpi=600)
-fig.subplots_adjust(wspace=0.1, hspace=0.3)
-fig.patch.set_facecolor("#eceff4")
-
-teamKeys = list(res.keys())
-
-for i, ax in enumerate(axs.flatten()):
-
-    if i >= len(res):
-        fig.delaxes(ax)
-        continue
-
-    ax.tick_params(axis="x", labelbottom=True)
-    dark_green = "#226f54"
-    light_green = "#c3d011"
-
-    # Create the colormap
-    cmap = mcolors.LinearSegmentedColormap.from_list(
-        "green_gradient", [light_green, dark_green]
-    )
-
-    plotFrame = res.get(teamKeys[i])
-
-    norm = plt.Normalize(vmin=1, vmax=maxBestPairings)
-    colors = [cmap(norm(value)) for value in plotFrame["Count"]]
-
-    bars = ax.barh(
-        plotFrame["Team"],
-        plotFrame["Count"],
-        color=colors,
-        edgecolor="grey",
-        alpha=0.8,
-    )
-
-    ax.set_yticks([])
-    for bar, team in zip(bars, plotFrame["Team"]):
-        text = ax.text(
-            x=0.2,  # A bit of padding from left edge
-            y=bar.get_y() + bar.get_height() / 2,
-            s=team,
-            va="center",
-            ha="left",
-            fontweight="bold",
-            fontsize=11,
-            color="white",
-        )
+fingerprint = visual_fingerprint(
+    list(res.values()), params={"max_best_pairings": maxBestPairings}
+)
+if is_up_to_date(OUTPUT_PATH, fingerprint):
+    print(f"{OUTPUT_PATH} is up to date, skipping render")
+    sys.exit(0)
 
-        text.set_path_effects(
-            [
-                path_effects.withStroke(linewidth=1.75, foreground="black"),
-            ]
-        )
+# Plotting is only imported past the render check, so cache hits skip it.
+import matplotlib.pyplot as plt
+from _commons import render_dpi
+from _small_multiples import draw_small_multiples
 
-    ax.axvline(0, color="black", lw=1)
-    ax.set_title(
-        f"{teamKeys[i]}",
-        fontsize=13,
-        # color="#5A5A5A",
-        fontweight="bold",
-        pad=8,
-    )
-    ax.grid(axis="x", linestyle="--", alpha=0.6)
-    ax.set_facecolor("#eceff4")
-    ax.invert_yaxis()
+plt.rcParams["font.family"] = "Monospace"
 
+fig = draw_small_multiples(
+    pd.concat(res.values()),
+    "team_tgt",
+    "Team",
+    "Count",
+    vmin=1,
+    vmax=maxBestPairings,
+    figsize=(12, 16),
+    dpi=render_dpi(600),
+)
 
 print("reaching")
 plt.savefig(
-    f"{OUTPUT_FOLDER}/{VISUAL_NAME}.png",
-    dpi=600,
+    OUTPUT_PATH,
+    dpi=render_dpi(600),
     facecolor="#eceff4",
     bbox_inches="tight",
     pad_inches=0.3,
     edgecolor="none",
     transparent=False,
 )
+record_render(OUTPUT_PATH, fingerprint, inputs={"cache": CACHE_PATH})
@@ -0,0 +1,289 @@
+"""
+Benchmark history and regression checks between commits.
+
+Usage:
+    python _bench_history.py list
+    python _bench_history.py import-runs runs/
+    python _bench_history.py compare --baseline <commit>
+    python _bench_history.py compare --baseline <commit> --candidate <commit>
+
+The history is the JSON-lines file `_benchmarks` appends to: one entry per
+case, dataset size, commit and machine, holding the raw timing samples.
+Instrumented pipeline runs can be added with `import-runs`, one entry per
+stage (``render:savefig``, ``transform:smashers_table``...) and run.
+
+`compare` puts each case and size timed on the same machine at both
+commits through Welch's t-test on log-times. A case is a regression when
+it got slower by more than `--min-slowdown` with p below `--alpha`, or
+when its time grows with dataset size faster than it used to (e.g. a
+linear step turned quadratic).
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import numpy as np
+import pandas as pd
+
+from datetime import datetime
+from _benchmarks import BENCHMARK_FILE
+from _instrumentation import environment
+
+HISTORY_FILE = BENCHMARK_FILE
+# Increase of the log-log slope of time against size that counts as worse
+# scaling: 0.5 is halfway from linear to quadratic.
+SCALING_TOLERANCE = 0.5
+
+
+def version(entry):
+    """
+    Commit an entry was timed at, marked when the tree had local changes.
+    """
+    commit = entry.get("commit") or "unknown"
+    return f"{commit}-dirty" if entry.get("dirty") else commit
+
+
+def append_history(entries, path=HISTORY_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def record_timings(case, samples, size, path=HISTORY_FILE, **extra):
+    """
+    Add the timing `samples` (seconds) of any timed code to the history.
+    """
+    entry = {
+        **environment(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "case": case,
+        "size": size,
+        "samples": list(samples),
+    }
+    append_history([{**entry, **extra}], path)
+
+
+def load_history(path=HISTORY_FILE):
+    """
+    The history as a frame, one row per entry, with a `version` column.
+    """
+    with open(path) as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    history = pd.DataFrame(entries)
+    history["version"] = [version(e) for e in entries]
+    return history
+
+
+def import_runs(folder, path=HISTORY_FILE):
+    """
+    Add the stage timings of the instrumented runs in `folder`. Each stage
+    of each run becomes one entry whose size is the run's name. Runs are
+    only imported once.
+    """
+    seen = set()
+    if os.path.exists(path):
+        seen = set(load_history(path).get("run_file", pd.Series()).dropna())
+
+    entries = []
+    for runPath in sorted(glob.glob(f"{folder}/*.json")):
+        runFile = os.path.basename(runPath)
+        if runFile in seen:
+            continue
+        with open(runPath) as f:
+            run = json.load(f)
+        samples = {}
+        for stage in run["stages"]:
+            if stage.get("cache") != "hit":
+                case = f"{stage['kind']}:{stage['stage']}"
+                samples.setdefault(case, []).append(stage["wall_s"])
+        for case, times in samples.items():
+            entries.append(
+                {
+                    "commit": run.get("commit"),
+                    "dirty": run.get("dirty", False),
+                    "host": run.get("host"),
+                    "started_at": run["started_at"],
+                    "case": case,
+                    "size": run["run"],
+                    "samples": times,
+                    "run_file": runFile,
+                }
+            )
+    append_history(entries, path)
+    return len(entries)
+
+
+def _welch(a, b):
+    from scipy.stats import ttest_ind
+
+    if len(a) < 2 or len(b) < 2:
+        return np.nan
+    return ttest_ind(np.log(a), np.log(b), equal_var=False).pvalue
+
+
+def _scaling(samples_by_size):
+    """
+    Log-log slope of median time against numeric dataset size.
+    """
+    sizes = [s for s in samples_by_size if isinstance(s, (int, float)) and s > 0]
+    if len(sizes) < 2:
+        return np.nan
+    medians = [np.median(samples_by_size[s]) for s in sizes]
+    return np.polyfit(np.log(sizes), np.log(medians), 1)[0]
+
+
+def _samples(history, ver):
+    """
+    ``{(case, size): all samples}`` of one version.
+    """
+    pooled = {}
+    for row in history[history["version"] == ver].itertuples():
+        pooled.setdefault((row.case, row.size), []).extend(row.samples)
+    return pooled
+
+
+def compare(
+    history,
+    baseline,
+    candidate=None,
+    host=None,
+    alpha=0.01,
+    min_slowdown=0.10,
+):
+    """
+    Per case and size, baseline and candidate median times, their ratio, the
+    Welch p-value and whether it is a regression. `baseline` and `candidate`
+    are commit prefixes (``-dirty`` for uncommitted trees); the candidate
+    defaults to the latest version timed. Raises ValueError when both are
+    the same version. Only entries of `host` (default: this machine) are
+    compared.
+    """
+    history = history[history["host"] == (host or platform.node())]
+    versions = list(dict.fromkeys(history["version"]))
+
+    def resolve(prefix):
+        dirty, commit = prefix.endswith("-dirty"), prefix.removesuffix("-dirty")
+        matches = [
+            v
+            for v in versions
+            if v.removesuffix("-dirty").startswith(commit)
+            and v.endswith("-dirty") == dirty
+        ]
+        if not matches:
+            raise KeyError(f"No benchmark history for {prefix!r} on this host")
+        return matches[-1]
+
+    baseline = resolve(baseline)
+    candidate = resolve(candidate) if candidate else versions[-1]
+    if candidate == baseline:
+        raise ValueError(f"Baseline and candidate are both {baseline!r}")
+    before, after = _samples(history, baseline), _samples(history, candidate)
+
+    rows = []
+    shared = sorted(
+        before.keys() & after.keys(), key=lambda k: (k[0], str(k[1]).rjust(9))
+    )
+    for case, size in shared:
+        a, b = np.asarray(before[case, size]), np.asarray(after[case, size])
+        ratio = np.median(b) / np.median(a)
+        pValue = _welch(a, b)
+        rows.append(
+            {
+                "case": case,
+                "size": size,
+                "baseline_ms": np.median(a) * 1000,
+                "candidate_ms": np.median(b) * 1000,
+                "ratio": ratio,
+                "p_value": pValue,
+                "regression": bool(ratio > 1 + min_slowdown and pValue < alpha),
+            }
+        )
+    report = pd.DataFrame(rows)
+    if report.empty:
+        return report, pd.DataFrame()
+
+    scaling = []
+    for case in report["case"].unique():
+        slopes = [
+            _scaling({s: v for (c, s), v in side.items() if c == case})
+            for side in (before, after)
+        ]
+        scaling.append(
+            {
+                "case": case,
+                "baseline_slope": slopes[0],
+                "candidate_slope": slopes[1],
+                "regression": bool(slopes[1] - slopes[0] > SCALING_TOLERANCE),
+            }
+        )
+    report.attrs.update(baseline=baseline, candidate=candidate)
+    return report, pd.DataFrame(scaling).dropna(subset=["candidate_slope"])
+
+
+def summarise_history(history):
+    return (
+        history.groupby(["host", "version"], sort=False)
+        .agg(
+            timed_at=("started_at", "max"),
+            cases=("case", "nunique"),
+            entries=("case", "size"),
+        )
+        .reset_index()
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--history", default=HISTORY_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="versions and machines in the history")
+    importParser = commands.add_parser("import-runs", help="add instrumented runs")
+    importParser.add_argument("folder", nargs="?", default="runs")
+    compareParser = commands.add_parser("compare", help="flag slowdowns")
+    compareParser.add_argument("--baseline", required=True)
+    compareParser.add_argument("--candidate", default=None)
+    compareParser.add_argument("--host", default=None)
+    compareParser.add_argument("--alpha", type=float, default=0.01)
+    compareParser.add_argument("--min-slowdown", type=float, default=0.10)
+    args = parser.parse_args()
+
+    if args.command == "import-runs":
+        print(f"{import_runs(args.folder, args.history)} entries added")
+        sys.exit(0)
+
+    history = load_history(args.history)
+    if args.command == "list":
+        print(summarise_history(history).to_string(index=False))
+        sys.exit(0)
+
+    report, scaling = compare(
+        history,
+        args.baseline,
+        args.candidate,
+        args.host,
+        args.alpha,
+        args.min_slowdown,
+    )
+    if report.empty:
+        sys.exit("No case was timed at both versions on this host")
+    print(f"{report.attrs['baseline']} -> {report.attrs['candidate']}")
+    with pd.option_context("display.width", 160, "display.max_rows", 500):
+        print(report.round(3).to_string(index=False))
+        if not scaling.empty:
+            print()
+            print(scaling.round(2).to_string(index=False))
+
+    slower = report[report["regression"]]
+    worse = scaling[scaling["regression"]] if not scaling.empty else scaling
+    for row in slower.itertuples():
+        print(f"REGRESSION {row.case} (size {row.size}): {row.ratio:.2f}x slower")
+    for row in worse.itertuples():
+        print(
+            f"REGRESSION {row.case}: time now grows as size^{row.candidate_slope:.2f}"
+            f" (was size^{row.baseline_slope:.2f})"
+        )
+    sys.exit(1 if len(slower) or len(worse) else 0)
@@ -0,0 +1,170 @@
+"""
+Benchmark the core transforms and the table renderer on synthetic leagues.
+
+Usage:
+    python _benchmarks.py                         # sizes 1, 10 and 50
+    python _benchmarks.py --sizes 1 5 --repeat 10 --cases separate_score
+
+Sizes are numbers of league-seasons (see `_synthetic`). Every case is run
+once to warm up, then `--repeat` times; each run appends one JSON line per
+case and size to `--output`, tagged with the git commit, so timings of
+different commits can be compared.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from datetime import datetime
+from _instrumentation import environment
+from _fbref_commons import (
+    calc_trend_from_values,
+    calculate_xpts,
+    filter_regular_season,
+    normalize_fbref_schedule,
+    separate_score,
+)
+from _sorare import fixture_pairings
+from _synthetic import (
+    BENCHMARK_LEAGUE,
+    synthetic_schedule,
+    synthetic_team_table,
+)
+
+BENCHMARK_FILE = "benchmarks/results.jsonl"
+SIZES = [1, 10, 50]
+HOME_COLS = {
+    "home_team": "team",
+    "away_team": "opponent",
+    "home_goals": "goals",
+    "away_goals": "opponent_goals",
+}
+AWAY_COLS = {
+    "home_team": "opponent",
+    "away_team": "team",
+    "home_goals": "opponent_goals",
+    "away_goals": "goals",
+}
+
+
+def _pairings_per_league(upcoming):
+    counts = []
+    for _, fixtures in upcoming.groupby(["league", "season"], sort=False):
+        teams = sorted(fixtures["home_team"].unique())
+        third = len(teams) // 3
+        strong, weak = teams[:third], teams[-third:]
+        counts.append(fixture_pairings(fixtures, strong, weak, strong, weak))
+    return pd.concat(counts, ignore_index=True)
+
+
+def _render_table(res):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from _table_commons import draw_heat_table
+
+    fig, ax = plt.subplots(figsize=(12, 8), dpi=100)
+    ax.set_axis_off()
+    draw_heat_table(ax, res, {c: c for c in res.columns})
+    fig.savefig(io.BytesIO(), format="png")
+    plt.close(fig)
+
+
+def benchmark_cases(size):
+    """
+    ``{name: (function, rows)}`` for `size` league-seasons; the functions
+    take no arguments and work on frames built here, outside the timing.
+    """
+    schedule = synthetic_schedule(size, played_share=0.5)
+    played = schedule[schedule["score"].notna()].copy()
+    upcoming = schedule[schedule["score"].isna()]
+    played["home_goals"], played["away_goals"] = separate_score(played["score"])
+    trends = np.random.default_rng(0).integers(0, 12, (16 * size, 5))
+    table = synthetic_team_table()
+
+    return {
+        "normalize_fbref_schedule": (
+            lambda: normalize_fbref_schedule(played, HOME_COLS, AWAY_COLS),
+            len(played),
+        ),
+        "separate_score": (lambda: separate_score(played["score"]), len(played)),
+        "filter_regular_season": (
+            lambda: filter_regular_season(schedule, BENCHMARK_LEAGUE),
+            len(schedule),
+        ),
+        "calc_trend_from_values": (
+            lambda: [calc_trend_from_values(values) for values in trends],
+            len(trends),
+        ),
+        "fixture_pairings": (lambda: _pairings_per_league(upcoming), len(upcoming)),
+        "calculate_xpts": (
+            lambda: calculate_xpts(played["home_xg"], played["away_xg"]),
+            len(played),
+        ),
+        "draw_heat_table": (lambda: _render_table(table), len(table)),
+    }
+
+
+def run_benchmarks(sizes=SIZES, repeat=5, cases=None):
+    """
+    Time every case at every size and return one record per case and size.
+    """
+    env = environment()
+    started = datetime.now().isoformat(timespec="seconds")
+    records = []
+    for size in sizes:
+        for name, (func, rows) in benchmark_cases(size).items():
+            if cases and name not in cases:
+                continue
+            func()
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                samples.append(time.perf_counter() - start)
+            records.append(
+                {
+                    **env,
+                    "started_at": started,
+                    "case": name,
+                    "size": size,
+                    "rows": rows,
+                    "samples": [round(s, 6) for s in samples],
+                    "min_s": round(min(samples), 6),
+                    "median_s": round(float(np.median(samples)), 6),
+                }
+            )
+            print(
+                f"{name:<26} size {size:>3} ({rows:>6} rows): "
+                f"min {min(samples) * 1000:9.2f} ms, "
+                f"median {np.median(samples) * 1000:9.2f} ms"
+            )
+    return records
+
+
+def write_results(records, path=BENCHMARK_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", nargs="+", default=None, help="only these cases")
+    parser.add_argument("--output", default=BENCHMARK_FILE)
+    args = parser.parse_args()
+
+    records = run_benchmarks(args.sizes, args.repeat, args.cases)
+    if not records:
+        sys.exit("No benchmark matched --cases")
+    write_results(records, args.output)
+    print(f"{len(records)} results appended to {args.output}")
@@ -1,16 +1,19 @@
-import matplotlib.pyplot as plt
+import matplotlib
 import os
-import pandas as pd
+import string
 import textwrap
 import urllib.request
 
-from PIL import Image
+from functools import lru_cache
+from matplotlib.artist import Artist
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+from matplotlib.image import BboxImage
 
-
-def flattenMultiCol(columns):
-    if isinstance(columns, pd.MultiIndex):
-        return ["_".join(map(str, col)).strip("_").lower() for col in columns.values]
-    return columns
+# Data helpers live with the FBref readers so data-only code can import them
+# without matplotlib; re-exported here for the scripts.
+from _fbref_commons import calc_trend_from_values, flattenMultiCol
 
 
 def justifyText(text, width):
@@ -58,48 +61,17 @@ def addTitleSubAndLogo(
     axPosition = ax.get_position()
     leftEdge = axPosition.x0
     rightEdge = axPosition.x1
-    figWidth = fig.get_size_inches()[0]
-
-    titleCharWidth = (subtitleFontSize * 0.68) / 72
-    titleCharNumber = int(figWidth / titleCharWidth)
-    titleJustified = justifyText(title, titleCharNumber)
-
-    subCharWidth = (subtitleFontSize * 0.68) / 72
-    subtitleCharNumber = int((figWidth * rightEdge - leftEdge) / subCharWidth)
-    subJustified = justifyText(subtitle, subtitleCharNumber)
-
-    titleHeight = estimateTextHeight(
-        fig, titleFontSize, len(title), titleCharNumber, titleLineSpacing
-    )
-    subtitleHeight = estimateTextHeight(
-        fig, subtitleFontSize, len(subtitle), subtitleCharNumber, subtitleLineSpacing
-    )
+    figWidth, figHeight = fig.get_size_inches()
+    blockWidth = (rightEdge - leftEdge) * figWidth * 72  # points
 
-    totalheight = subtitleHeight
-
-    # Shift all axes down
-    for ax in fig.axes:
-        pos = ax.get_position()
-        new_pos = [pos.x0, pos.y0, pos.width, pos.height]
-        new_pos[1] -= totalheight  # shift up
-        ax.set_position(new_pos)
-
-    # Add the actual text
-    y = 1.0
-    fig.text(
-        leftEdge,
-        y,
-        titleJustified,
+    titleStyle = dict(
         ha="left",
         va="top",
         fontsize=titleFontSize,
         weight="bold",
+        linespacing=titleLineSpacing,
     )
-    y -= titleHeight + spacing
-    fig.text(
-        leftEdge,
-        y,
-        subJustified,
+    subStyle = dict(
         ha="left",
         va="top",
         fontsize=subtitleFontSize,
@@ -107,8 +79,33 @@ def addTitleSubAndLogo(
         linespacing=subtitleLineSpacing,
     )
 
+    titleJustified = justify_measured(title, blockWidth, titleFontSize, "bold")
+    subJustified = justify_measured(subtitle, blockWidth, subtitleFontSize)
+
+    # Heights are measured rather than estimated, in figure fractions.
+    titleHeight = measure_text(titleJustified, **titleStyle)[1] / 72 / figHeight
+    firstLineHeight = (
+        measure_text(titleJustified.split("\n")[0], **titleStyle)[1] / 72 / figHeight
+    )
+    subtitleHeight = measure_text(subJustified, **subStyle)[1] / 72 / figHeight
+
+    # The layout leaves room for a one-line title; only extra lines push the
+    # axes down further.
+    totalheight = subtitleHeight + (titleHeight - firstLineHeight)
+
+    # Shift all axes down
+    for axis in fig.axes:
+        pos = axis.get_position()
+        axis.set_position([pos.x0, pos.y0 - totalheight, pos.width, pos.height])
+
+    # Add the actual text
+    y = 1.0
+    fig.text(leftEdge, y, titleJustified, **titleStyle)
+    y -= titleHeight + spacing
+    fig.text(leftEdge, y, subJustified, **subStyle)
+
     if logo:
-        team_icon = Image.open(urllib.request.urlopen(logo)).convert("LA")
+        team_icon = fetch_logo(logo, mode="LA")
         logo_ax = ax.inset_axes([0.95, 0.95, 0.05, 0.05], transform=ax.transAxes)
         logo_ax.imshow(team_icon)
         logo_ax.axis("off")
@@ -128,19 +125,329 @@ def addTitleSubAndLogo(
 # NEW RELEASE
 
 import numpy as np
-from scipy.stats import linregress
+import matplotlib.colors as mcolors
+import matplotlib.patheffects as path_effects
+from matplotlib.collections import PolyCollection
+
+
+@lru_cache(maxsize=None)
+def fetch_logo(url, mode="RGBA"):
+    """
+    Download a logo once per process and return it as a PIL image.
+    """
+    from PIL import Image
+
+    return Image.open(urllib.request.urlopen(url)).convert(mode)
+
+
+def gap_shading_colors(diff, pos_color, neg_color):
+    """
+    Vectorised colour ramp for the area between two lines.
+
+    Segments where `diff` is positive lean towards `pos_color`, the others
+    towards `neg_color`, and the closer |diff| is to zero the more the two
+    colours are blended. Returns an (n, 4) RGBA array.
+    """
+    diff = np.asarray(diff, dtype=float)
+    scale = np.nanmax(np.abs(diff)) if len(diff) else 0
+    mag = np.abs(diff) / scale if scale else np.zeros_like(diff)
+    mag = (0.65 + 0.35 * mag)[:, None]
+
+    pos = np.array(mcolors.to_rgb(pos_color))
+    neg = np.array(mcolors.to_rgb(neg_color))
+    base = np.where(diff[:, None] > 0, pos, neg)
+    blend = np.where(diff[:, None] > 0, neg, pos)
+    rgb = mag * base + (1 - mag) * blend
+
+    # Quantise like to_hex() so colours match the per-segment version.
+    rgb = np.round(rgb * 255) / 255
+    return np.column_stack([rgb, np.ones(len(rgb))])
+
+
+def add_gap_shading(ax, x, y1, y2, pos_color, neg_color, **kwargs):
+    """
+    Shade the gap between `y1` and `y2` one x-step at a time, coloured by the
+    sign and size of ``y1 - y2``, using a single PolyCollection.
+
+    Extra keyword arguments (zorder, alpha, linewidth, ...) are passed to the
+    collection, as they would be to ``ax.fill_between``.
+    """
+    x, y1, y2 = (np.asarray(v, dtype=float) for v in (x, y1, y2))
+    verts = np.stack(
+        [
+            np.column_stack([x[:-1], y2[:-1]]),
+            np.column_stack([x[:-1], y1[:-1]]),
+            np.column_stack([x[1:], y1[1:]]),
+            np.column_stack([x[1:], y2[1:]]),
+        ],
+        axis=1,
+    )
+    colors = gap_shading_colors(y1 - y2, pos_color, neg_color)[1:]
+    alpha = kwargs.pop("alpha", None)
+    if alpha is not None:
+        colors[:, 3] = alpha
+
+    coll = PolyCollection(verts, facecolors=colors, edgecolors=colors, **kwargs)
+    ax.add_collection(coll)
+    return coll
+
+
+# Named render profiles, picked per run with the RENDER_PROFILE environment
+# variable. "print" keeps each visual's own dpi and is the default.
+RENDER_PROFILES = {
+    "draft": {"dpi": 72, "path_effects": False},
+    "web": {"dpi": 150, "path_effects": True},
+    "print": {"dpi": None, "path_effects": True},
+}
+
+
+def get_render_profile():
+    name = os.environ.get("RENDER_PROFILE", "print")
+    if name not in RENDER_PROFILES:
+        raise ValueError(
+            f"Unknown RENDER_PROFILE {name!r}, expected one of {list(RENDER_PROFILES)}"
+        )
+    return RENDER_PROFILES[name]
+
+
+def render_dpi(dpi):
+    """
+    Resolution to use for a visual whose final (print) resolution is `dpi`.
+    """
+    profileDpi = get_render_profile()["dpi"]
+    return dpi if profileDpi is None else min(dpi, profileDpi)
+
+
+def stroke_effects(linewidth, foreground):
+    """
+    Text outline path effects, dropped entirely in the draft profile.
+    """
+    if not get_render_profile()["path_effects"]:
+        return []
+    return [path_effects.withStroke(linewidth=linewidth, foreground=foreground)]
+
+
+# Text is measured on a small off-screen figure at a high resolution, so font
+# hinting does not skew the extents. Results are returned in points.
+PROBE_DPI = 720
 
 
-def calc_trend_from_values(values):
+@lru_cache(maxsize=None)
+def text_probe():
+    fig = Figure(dpi=PROBE_DPI)
+    return fig, FigureCanvasAgg(fig).get_renderer()
 
-    values = np.array(values, dtype=float)
-    values = values[~np.isnan(values)]
 
-    if len(values) < 2 or np.all(values == 0):
-        return 0.0
+def measure_text(text, **textKwargs):
+    """
+    Width and height in points of `text` as ``fig.text(..., **textKwargs)``
+    would lay it out, without drawing anything.
+    """
+    fig, renderer = text_probe()
+    probe = fig.text(0, 0, text, **textKwargs)
+    box = probe.get_window_extent(renderer)
+    probe.remove()
+    return box.width * 72 / PROBE_DPI, box.height * 72 / PROBE_DPI
 
-    x = np.arange(len(values))
-    slope, _, _, _, _ = linregress(x, values)
-    slope_normalized = slope / (np.mean(values) + 1e-6)
 
-    return slope_normalized
+@lru_cache(maxsize=None)
+def glyph_widths(fontsize, weight="normal", family=None):
+    """
+    Advance widths in points, per character, for one font and size. The
+    table starts with printable ASCII and grows as other characters are met.
+    """
+    prop = FontProperties(family=list(family or matplotlib.rcParams["font.family"]))
+    prop.set_size(fontsize)
+    prop.set_weight(weight)
+    _, renderer = text_probe()
+
+    def advance(text):
+        w, _, _ = renderer.get_text_width_height_descent(text, prop, ismath=False)
+        return w * 72 / PROBE_DPI
+
+    # Measure between two bars so spaces and side bearings are counted.
+    bars = advance("||")
+    return _GlyphTable(lambda c: advance(f"|{c}|") - bars, string.printable[:95])
+
+
+class _GlyphTable(dict):
+    def __init__(self, measure, chars):
+        super().__init__((c, measure(c)) for c in chars)
+        self._measure = measure
+
+    def __missing__(self, char):
+        self[char] = self._measure(char)
+        return self[char]
+
+    def width(self, text):
+        return sum(self[c] for c in text)
+
+
+def justify_measured(text, maxWidth, fontsize, weight="normal"):
+    """
+    Wrap `text` to `maxWidth` points and justify every line but the last by
+    padding the gaps between words, using measured glyph widths.
+    """
+    glyphs = glyph_widths(fontsize, weight, tuple(matplotlib.rcParams["font.family"]))
+    spaceWidth = glyphs[" "]
+
+    lines, current = [], []
+    for word in text.split():
+        if current and glyphs.width(" ".join(current + [word])) > maxWidth:
+            lines.append(current)
+            current = []
+        current.append(word)
+    lines.append(current)
+
+    justified = []
+    for words in lines[:-1]:
+        if len(words) == 1:
+            justified.append(words[0])
+            continue
+        free = maxWidth - glyphs.width("".join(words))
+        totalSpaces = max(len(words) - 1, int(free // spaceWidth))
+        spaceCount, extra = divmod(totalSpaces, len(words) - 1)
+        line = ""
+        for i, word in enumerate(words[:-1]):
+            line += word + " " * (spaceCount + (1 if i < extra else 0))
+        justified.append(line + words[-1])
+    justified.append(" ".join(lines[-1]))
+    return "\n".join(justified)
+
+
+def style_axes(ax, grid_axis="both", facecolor="#eeeeee"):
+    """
+    House style for data axes: flat background, no top/right spines and a
+    dashed light-grey grid.
+    """
+    ax.set_facecolor(facecolor)
+    ax.spines["right"].set_visible(False)
+    ax.spines["top"].set_visible(False)
+    ax.grid(visible=True, ls="--", color="lightgrey", axis=grid_axis)
+
+
+class _CachedLayer(Artist):
+    """
+    A pre-rendered figure background. On Agg canvases of the same size it is
+    pasted straight into the pixel buffer; at any other size it is resampled
+    like an image.
+    """
+
+    def __init__(self, region, pixels):
+        super().__init__()
+        self._region = region
+        self._pixels = pixels
+        self.set_zorder(-1)
+
+    def draw(self, renderer):
+        size = (int(renderer.height), int(renderer.width))
+        if hasattr(renderer, "restore_region") and size == self._pixels.shape[:2]:
+            renderer.restore_region(self._region)
+            return
+        image = BboxImage(self.get_figure().bbox, interpolation="antialiased")
+        image.set_data(self._pixels)
+        image.set_figure(self.get_figure())
+        image.draw(renderer)
+
+
+@lru_cache(maxsize=32)
+def _template_layers(figsize, dpi, facecolor, axRect, source):
+    """
+    Render the static layers of a chart once: the background, the empty data
+    axes and the source credit. Titles and logos differ between variants of
+    a chart, so they are drawn on each figure instead.
+    """
+    fig = Figure(figsize=figsize, dpi=dpi, facecolor=facecolor)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes(axRect)
+    ax.set_facecolor(facecolor)
+    ax.set_xticks([])
+    ax.set_yticks([])
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    if source:
+        ax.text(
+            x=1,
+            y=0.025,
+            s=source,
+            transform=ax.transAxes,
+            ha="right",
+            fontsize=9,
+            alpha=0.7,
+        )
+
+    canvas.draw()
+    return _CachedLayer(
+        canvas.copy_from_bbox(fig.bbox), np.asarray(canvas.buffer_rgba()).copy()
+    )
+
+
+def templated_figure(
+    figsize,
+    dpi,
+    title=None,
+    subtitle="",
+    source=None,
+    logo=None,
+    titleFontSize=15,
+    subtitleFontSize=9,
+    subtitleLineSpacing=1.5,
+    facecolor="#eeeeee",
+    grid_axis="both",
+    pad=0.3,
+    rect=(0.125, 0.11, 0.775, 0.77),
+    spacing=0.02,
+):
+    """
+    Create a figure whose background, empty data axes and source credit come
+    from a cached raster shared by every figure with the same size, style and
+    layout. The title, subtitle and logo are drawn on top, so the variants of
+    a chart (one per team...) share one template.
+
+    The data axes fill `rect` (matplotlib's default subplot area), shortened
+    from the top when the header, `pad` inches below the top edge, needs the
+    room. The layout is fixed, so save these figures without
+    ``bbox_inches="tight"``; saving at the figure's own dpi lets the
+    background be copied instead of resampled.
+    """
+    figWidth, figHeight = figsize
+    left, bottom, width, height = rect
+    top = bottom + height
+    header = []
+    if title:
+        titleStyle = dict(ha="left", va="top", fontsize=titleFontSize, weight="bold")
+        subStyle = dict(
+            ha="left",
+            va="top",
+            fontsize=subtitleFontSize,
+            color="#5A5A5A",
+            linespacing=subtitleLineSpacing,
+        )
+        blockWidth = width * figWidth * 72  # points
+        y = 1 - pad / figHeight
+        for text, style in ((title, titleStyle), (subtitle, subStyle)):
+            if not text:
+                continue
+            justified = justify_measured(
+                text, blockWidth, style["fontsize"], style.get("weight", "normal")
+            )
+            header.append((y, justified, style))
+            y -= measure_text(justified, **style)[1] / 72 / figHeight + spacing
+        top = min(top, y)
+    axRect = (left, bottom, width, top - bottom)
+
+    layer = _template_layers(tuple(figsize), dpi, facecolor, axRect, source)
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=figsize, dpi=dpi, facecolor=facecolor)
+    fig.add_artist(_CachedLayer(layer._region, layer._pixels))
+    for y, text, style in header:
+        fig.text(left, y, text, **style)
+    ax = fig.add_axes(axRect)
+    style_axes(ax, grid_axis, facecolor)
+    ax.patch.set_visible(False)
+    if logo:
+        logo_ax = ax.inset_axes([0.95, 0.95, 0.05, 0.05], transform=ax.transAxes)
+        logo_ax.imshow(fetch_logo(logo, mode="LA"))
+        logo_ax.axis("off")
+    return fig, ax
@@ -0,0 +1,235 @@
+"""
+Team-season aggregate cube of the stored schedules.
+
+Usage:
+    python _cube.py rebuild
+    python _cube.py show --leagues "GER-Bundesliga" --seasons 2324 2425
+
+One row per league, season, team and side (home or away) with the additive
+aggregates the scripts keep regrouping schedules for: matches, results,
+points, goals and xG for and against, clean sheets, big clean wins (2+
+scored, none conceded) and attendance. Rates are derived from the sums,
+e.g. ``goals_for / matches``, and sides are summed away with
+`team_season_totals`.
+
+The cube is stored as the ``cube`` table of `_store`, one partition per
+league-season, next to the ids of the matches it counts; the two are
+swapped in together. Storing a schedule updates it: only matches whose id
+the partition has not counted yet are aggregated and added in, so a
+matchday landing adds ten matches' worth of work, not a season's. Scores
+FBref corrects after the fact are only picked up by `rebuild`.
+"""
+
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+from _fbref_commons import has_score, normalize_fbref_schedule, separate_score
+from _schema import apply_schema
+from _store import PARTITION_KEYS, STORE_FOLDER, partition_path, read_table
+
+CUBE_KEYS = ["league", "season", "team", "side"]
+MEASURES = [
+    "matches",
+    "wins",
+    "draws",
+    "losses",
+    "points",
+    "goals_for",
+    "goals_against",
+    "clean_sheets",
+    "big_clean_wins",
+    "xg_matches",
+    "xg_for",
+    "xg_against",
+    "attendance_matches",
+    "attendance",
+]
+HOME_COLS = {
+    "home_team": "team",
+    "away_team": "opponent",
+    "home_xg": "xg_for",
+    "away_xg": "xg_against",
+    "home_goals": "goals_for",
+    "away_goals": "goals_against",
+}
+AWAY_COLS = {
+    "home_team": "opponent",
+    "away_team": "team",
+    "home_xg": "xg_against",
+    "away_xg": "xg_for",
+    "home_goals": "goals_against",
+    "away_goals": "goals_for",
+}
+
+
+def match_ids(schedule):
+    """
+    Id of every match: FBref's game id, or the game label where it has none.
+    """
+    ids = schedule["game_id"] if "game_id" in schedule else schedule["game"]
+    return ids.astype(object).fillna(schedule["game"].astype(object)).astype(str)
+
+
+def aggregate(schedule):
+    """
+    Cube rows of the played matches of `schedule`. Matches without a score
+    to read (postponed, abandoned) are left out, as in `_query`.
+    """
+    played = schedule[has_score(schedule["score"].astype(str)).to_numpy()]
+    df = pd.DataFrame(
+        {
+            "league": played["league"].astype(str),
+            "season": played["season"].astype(str),
+            "home_team": played["home_team"].astype(str),
+            "away_team": played["away_team"].astype(str),
+        }
+    )
+    df["home_goals"], df["away_goals"] = separate_score(played["score"].astype(str))
+    for column in ("home_xg", "away_xg", "attendance"):
+        values = played[column] if column in played else np.nan
+        df[column] = pd.to_numeric(values, errors="coerce")
+
+    rows = normalize_fbref_schedule(df, HOME_COLS, AWAY_COLS)
+    goals, against = rows["goals_for"], rows["goals_against"]
+    rows = rows.assign(
+        side=np.where(rows["at_home"], "home", "away"),
+        matches=1,
+        wins=goals > against,
+        draws=goals == against,
+        losses=goals < against,
+        points=3 * (goals > against) + (goals == against),
+        clean_sheets=against == 0,
+        big_clean_wins=(goals >= 2) & (against == 0),
+        xg_matches=rows["xg_for"].notna(),
+        attendance_matches=rows["attendance"].notna(),
+    )
+    return rows.groupby(CUBE_KEYS)[MEASURES].sum().reset_index()
+
+
+def _ids_path(league, season, folder):
+    return os.path.join(
+        os.path.dirname(partition_path("cube", league, season, folder)),
+        "game_ids.parquet",
+    )
+
+
+def _write_partition(cube, ids, league, season, folder):
+    """
+    Swap in a cube partition and the ids it counts together: both are written
+    aside, then the cube and the ids are swapped in, in that order.
+    """
+    path = partition_path("cube", league, season, folder)
+    idsPath = _ids_path(league, season, folder)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    part = apply_schema(cube, "cube").drop(columns=PARTITION_KEYS)
+    part.to_parquet(f"{path}.tmp", index=False)
+    pd.DataFrame({"game_id": ids}).to_parquet(f"{idsPath}.tmp", index=False)
+    os.replace(f"{path}.tmp", path)
+    os.replace(f"{idsPath}.tmp", idsPath)
+
+
+def _recover_partition(league, season, folder):
+    """
+    Finish or undo a `_write_partition` a crash interrupted, so the cube
+    never counts a match twice or misses one.
+    """
+    path = partition_path("cube", league, season, folder)
+    idsPath = _ids_path(league, season, folder)
+    if not os.path.exists(f"{idsPath}.tmp"):
+        return
+    if os.path.exists(f"{path}.tmp"):
+        # Nothing was swapped in yet: the matches are still to be counted.
+        os.remove(f"{path}.tmp")
+        os.remove(f"{idsPath}.tmp")
+    else:
+        os.replace(f"{idsPath}.tmp", idsPath)
+
+
+def update_cube(schedule, folder=STORE_FOLDER, rebuild=False):
+    """
+    Add the played matches of `schedule` the cube has not counted yet, or
+    recount its league-seasons from scratch with `rebuild`. Returns the
+    number of matches added.
+    """
+    # Postponed matches stay uncounted until they have a score.
+    played = schedule[has_score(schedule["score"].astype(str)).to_numpy()]
+    added = 0
+    for (league, season), matches in played.groupby(
+        [played["league"].astype(str), played["season"].astype(str)]
+    ):
+        _recover_partition(league, season, folder)
+        idsPath = _ids_path(league, season, folder)
+        ids = match_ids(matches)
+        seen = set()
+        if os.path.exists(idsPath) and not rebuild:
+            seen = set(pd.read_parquet(idsPath)["game_id"])
+        new = matches[~ids.isin(seen).to_numpy()]
+        if new.empty:
+            continue
+
+        cube = aggregate(new)
+        if seen:
+            stored = read_table("cube", [league], [season], folder=folder)
+            cube = (
+                pd.concat([stored.astype({k: str for k in CUBE_KEYS}), cube])
+                .groupby(CUBE_KEYS)[MEASURES]
+                .sum()
+                .reset_index()
+            )
+        counted = sorted(seen | set(ids[~ids.isin(seen)]))
+        _write_partition(cube, counted, league, season, folder)
+        added += len(new)
+    return added
+
+
+def rebuild_cube(folder=STORE_FOLDER):
+    """
+    Recount the cube from every stored schedule.
+    """
+    return update_cube(read_table("schedule", folder=folder), folder, rebuild=True)
+
+
+def read_cube(leagues=None, seasons=None, side=None, folder=STORE_FOLDER):
+    """
+    Cube rows of `leagues` and `seasons`, of one `side` ("home" or "away")
+    when given.
+    """
+    cube = read_table("cube", leagues, seasons, folder=folder)
+    if side is not None:
+        cube = cube[cube["side"] == side].reset_index(drop=True)
+    return cube
+
+
+def team_season_totals(cube):
+    """
+    `cube` summed over sides: one row per league, season and team.
+    """
+    return (
+        cube.groupby(["league", "season", "team"], observed=True)[MEASURES]
+        .sum()
+        .reset_index()
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--store", default=STORE_FOLDER)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="recount from the stored schedules")
+    showParser = commands.add_parser("show", help="print team-season totals")
+    showParser.add_argument("--leagues", nargs="+", default=None)
+    showParser.add_argument("--seasons", nargs="+", default=None)
+    showParser.add_argument("--side", choices=["home", "away"], default=None)
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        print(f"{rebuild_cube(args.store)} matches counted")
+    else:
+        cube = read_cube(args.leagues, args.seasons, args.side, args.store)
+        totals = team_season_totals(cube).sort_values(
+            ["league", "season", "points"], ascending=[True, True, False]
+        )
+        with pd.option_context("display.width", 200, "display.max_rows", 500):
+            print(totals.to_string(index=False))
@@ -0,0 +1,23 @@
+"""
+Content hashes of frames, shared by the render manifest, the pipeline and the
+data caches (see `_render_cache`, `_pipeline`, `_rankings`).
+"""
+
+import hashlib
+import json
+import pickle
+import pandas as pd
+
+
+def frame_digest(frame):
+    """
+    Content hash of a DataFrame or Series: values, index, columns and dtypes.
+    """
+    frame = frame.to_frame() if isinstance(frame, pd.Series) else frame
+    try:
+        rows = pd.util.hash_pandas_object(frame, index=True).values
+    except TypeError:
+        # Unhashable cells (lists, dicts): fall back to the pickled frame.
+        return hashlib.sha256(pickle.dumps(frame)).hexdigest()
+    header = json.dumps([list(map(str, frame.columns)), list(map(str, frame.dtypes))])
+    return hashlib.sha256(header.encode() + rows.tobytes()).hexdigest()
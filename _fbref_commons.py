@@ -1,5 +1,70 @@
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
 
+from concurrent.futures import ThreadPoolExecutor
+from _schema import apply_schema
+
+
+def flattenMultiCol(columns):
+    if isinstance(columns, pd.MultiIndex):
+        return ["_".join(map(str, col)).strip("_").lower() for col in columns.values]
+    return columns
+
+
+def calc_trend_from_values(values):
+
+    values = np.array(values, dtype=float)
+    values = values[~np.isnan(values)]
+
+    if len(values) < 2 or np.all(values == 0):
+        return 0.0
+
+    # Least-squares slope, computed as scipy.stats.linregress does.
+    x = np.arange(len(values))
+    ssxm, ssxym, _, _ = np.cov(x, values, bias=1).flat
+    slope = ssxym / ssxm
+    slope_normalized = slope / (np.mean(values) + 1e-6)
+
+    return slope_normalized
+
+
+def calculate_xpts(home_xg, away_xg, max_goals=5):
+    """
+    Expected points of both sides from their xG, scoring each side's goals
+    as independent Poisson counts up to `max_goals`. Takes scalars or arrays
+    (one entry per match) and returns a pair of the same shape.
+    """
+    home_xg, away_xg = np.asarray(home_xg, float), np.asarray(away_xg, float)
+    goals = np.arange(max_goals + 1)
+    factorials = np.cumprod(np.maximum(goals, 1))
+
+    def pmf(xg):
+        xg = xg[..., None]
+        return xg**goals * np.exp(-xg) / factorials
+
+    match_probs = pmf(home_xg)[..., :, None] * pmf(away_xg)[..., None, :]
+    p_home_win = np.tril(match_probs, -1).sum(axis=(-2, -1))
+    p_draw = np.diagonal(match_probs, axis1=-2, axis2=-1).sum(axis=-1)
+    p_away_win = np.triu(match_probs, 1).sum(axis=(-2, -1))
+
+    home_xpts = (3 * p_home_win) + (1 * p_draw)
+    away_xpts = (3 * p_away_win) + (1 * p_draw)
+
+    return home_xpts, away_xpts
+
+
+def fbref_client(leagues, seasons):
+    """
+    soccerdata FBref reader, imported on first use: only runs that miss their
+    data cache pay for soccerdata and its scraping stack.
+    """
+    import soccerdata as sd
+
+    return sd.FBref(leagues=leagues, seasons=seasons)
+
 
 def normalize_fbref_schedule(df: pd.DataFrame, home_cols, away_cols) -> pd.DataFrame:
     """
@@ -29,11 +94,25 @@ def normalize_fbref_schedule(df: pd.DataFrame, home_cols, away_cols) -> pd.DataF
     return pd.concat([home_df, away_df], ignore_index=True)
 
 
+# Home and away goals around any dash; shoot-out scores are parenthesised.
+SCORE_PATTERN = r"(\d+)\s*[-–—−]\s*(\d+)"
+
+
+def has_score(score_series: pd.Series) -> pd.Series:
+    """
+    Whether each score of a Series can be split by `separate_score`: not
+    missing, postponed or abandoned.
+    """
+    return score_series.str.count(SCORE_PATTERN).gt(0)
+
+
 def separate_score(score_series: pd.Series) -> pd.DataFrame:
     """
-    Splits a score Series (e.g., '2–1') into two integer Series.
+    Splits a score Series (e.g., '2–1') into two integer Series. Any dash
+    separates the goals, and penalty shoot-outs, as in '(4) 1–1 (3)', are
+    left out.
     """
-    scores = score_series.str.split("–", expand=True)
+    scores = score_series.str.extract(SCORE_PATTERN)
     home_goals = scores[0].astype(int)
     away_goals = scores[1].astype(int)
 
@@ -53,3 +132,129 @@ def filter_regular_season(
             return df
         case _:
             return df
+
+
+FBREF_FOLDER = "fbrefData"
+PLAYER_KEYS = ["league", "season", "team", "player"]
+PLAYER_STAT_TYPES = [
+    "standard",
+    "shooting",
+    "passing",
+    "passing_types",
+    "goal_shot_creation",
+    "defense",
+    "possession",
+    "playing_time",
+    "misc",
+    "keeper",
+    "keeper_adv",
+]
+# Minimum spacing between FBref page requests, as in soccerdata's own reader.
+FBREF_RATE_LIMIT = 7
+
+
+class _Throttle:
+    """
+    Lets callers through at most once every `interval` seconds, across threads.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next)
+            self.next = start + self.interval
+        time.sleep(start - now)
+
+
+def _read_stat_type(league, season, stat_type, throttle):
+    throttle.wait()
+    fbref = fbref_client(league, season)
+    df = fbref.read_player_season_stats(stat_type=stat_type)
+    df.columns = flattenMultiCol(df.columns)
+    return df
+
+
+def player_table_path(league, season, folder=FBREF_FOLDER):
+    return f"{folder}/{league}_{season}_players.parquet"
+
+
+def build_player_table(
+    league, season, stat_types=PLAYER_STAT_TYPES, max_workers=3, folder=FBREF_FOLDER
+):
+    """
+    Fetch every player-season stat type of a league-season and join them on
+    the player key into one wide parquet table, in the compact dtypes of
+    `_schema`.
+
+    Stat types are read concurrently, with page requests spaced by
+    `FBREF_RATE_LIMIT` so the pool stays within FBref's rate limit; parsing
+    one page overlaps with waiting for the next. Columns with the same name
+    in several stat types (nation, pos, age, 90s...) are kept once; the
+    standard table's "playing time_90s" is the same figure under its own name.
+    """
+    # The league and season index pages are shared by every stat type: fetch
+    # them once up front instead of from every worker at the same time.
+    fbref_client(league, season).read_seasons()
+
+    throttle = _Throttle(FBREF_RATE_LIMIT)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = list(
+            pool.map(
+                lambda stat_type: _read_stat_type(league, season, stat_type, throttle),
+                stat_types,
+            )
+        )
+
+    wide = frames[0]
+    for frame in frames[1:]:
+        wide = wide.join(
+            frame[frame.columns.difference(wide.columns, sort=False)], how="outer"
+        )
+
+    os.makedirs(folder, exist_ok=True)
+    path = player_table_path(league, season, folder)
+    apply_schema(wide.reset_index(), "players").to_parquet(path, index=False)
+    return path
+
+
+def read_player_table(league, season, columns=None, folder=FBREF_FOLDER):
+    """
+    Read the wide player table of a league-season, building it on first use.
+    Only the key columns plus `columns` are loaded when `columns` is given.
+    Tables stored before the compact dtypes are converted on load.
+    """
+    path = player_table_path(league, season, folder)
+    if not os.path.exists(path):
+        build_player_table(league, season, folder=folder)
+    if columns is not None:
+        columns = PLAYER_KEYS + [c for c in columns if c not in PLAYER_KEYS]
+    df = pd.read_parquet(path, columns=columns)
+    return apply_schema(df, "players", validate=columns is None)
+
+
+def lineup_table_path(league, season, folder=FBREF_FOLDER):
+    return f"{folder}/{league}_{season}_lineups.parquet"
+
+
+def read_lineup_table(league, season, match_ids=None, folder=FBREF_FOLDER):
+    """
+    Lineups of every match of a league-season as one table, one row per
+    player and match, fetched and stored on first use. That first fetch is
+    one FBref request per match, a season's worth; given `match_ids`, only
+    the lineups of those matches are fetched and nothing is stored.
+    """
+    if match_ids is not None:
+        lineups = fbref_client(league, season).read_lineup(match_id=list(match_ids))
+        return apply_schema(lineups.reset_index(), "lineups")
+
+    path = lineup_table_path(league, season, folder)
+    if not os.path.exists(path):
+        lineups = fbref_client(league, season).read_lineup()
+        os.makedirs(folder, exist_ok=True)
+        apply_schema(lineups.reset_index(), "lineups").to_parquet(path, index=False)
+    return apply_schema(pd.read_parquet(path), "lineups")
@@ -0,0 +1,109 @@
+"""
+Report the import cost of the shared modules and of the scripts' cold start.
+
+Usage:
+    python _import_report.py                          # every shared _*.py module
+    python _import_report.py _rankings _teams --top 10
+    python _import_report.py 250816_table_findOccasionalSmashersInJPL.py
+
+Each target is imported (or, for a script, run) in a fresh interpreter under
+``python -X importtime``. The report gives the total import time, the
+slowest top-level imports and which heavy packages got loaded, so a
+data-only module or a cached run that starts pulling in matplotlib or
+soccerdata shows up. `--budget` makes the report fail above a total time.
+"""
+
+import argparse
+import glob
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Packages worth deferring until a run actually draws or fetches something.
+HEAVY_PACKAGES = ["matplotlib", "scipy", "soccerdata", "PIL", "sklearn"]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def shared_modules():
+    here = os.path.dirname(os.path.abspath(__file__))
+    names = [os.path.basename(p)[:-3] for p in glob.glob(os.path.join(here, "_*.py"))]
+    return sorted(n for n in names if n != "_import_report")
+
+
+def import_times(target):
+    """
+    Import `target` (a module name, or a script path to run) in a new
+    interpreter and return its ``-X importtime`` entries as dicts with
+    `module`, `self_ms`, `cumulative_ms` and `depth`, plus the wall time.
+    """
+    command = [sys.executable, "-X", "importtime"]
+    command += [target] if target.endswith(".py") else ["-c", f"import {target}"]
+    start = time.perf_counter()
+    run = subprocess.run(command, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    entries = []
+    for line in run.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            selfUs, cumulativeUs, indent, module = match.groups()
+            entries.append(
+                {
+                    "module": module,
+                    "self_ms": int(selfUs) / 1000,
+                    "cumulative_ms": int(cumulativeUs) / 1000,
+                    "depth": len(indent) // 2,
+                }
+            )
+    if run.returncode != 0 and not entries:
+        raise RuntimeError(f"{target} failed:\n{run.stderr[-2000:]}")
+    return entries, wall
+
+
+def summarise(target, entries, wall, top=5):
+    topLevel = [e for e in entries if e["depth"] == 0]
+    loaded = {e["module"].split(".")[0] for e in entries}
+    return {
+        "target": target,
+        "import_ms": round(sum(e["cumulative_ms"] for e in topLevel), 1),
+        "wall_ms": round(wall * 1000, 1),
+        "heavy": [p for p in HEAVY_PACKAGES if p in loaded],
+        "slowest": sorted(topLevel, key=lambda e: -e["cumulative_ms"])[:top],
+    }
+
+
+def print_report(summaries):
+    for summary in summaries:
+        heavy = ", ".join(summary["heavy"]) or "none"
+        print(
+            f"{summary['target']}: {summary['import_ms']:.0f} ms of imports, "
+            f"{summary['wall_ms']:.0f} ms wall, heavy packages: {heavy}"
+        )
+        for entry in summary["slowest"]:
+            print(f"    {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "targets", nargs="*", help="modules or scripts (default: shared modules)"
+    )
+    parser.add_argument("--top", type=int, default=5, help="slowest imports shown")
+    parser.add_argument(
+        "--budget", type=float, default=None, help="fail above this many ms"
+    )
+    args = parser.parse_args()
+
+    summaries = [
+        summarise(target, *import_times(target), top=args.top)
+        for target in args.targets or shared_modules()
+    ]
+    print_report(summaries)
+    if args.budget is not None:
+        over = [s["target"] for s in summaries if s["import_ms"] > args.budget]
+        if over:
+            print(f"Over the {args.budget:.0f} ms budget: {', '.join(over)}")
+            sys.exit(1)
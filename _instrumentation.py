@@ -0,0 +1,216 @@
+"""
+Wall time, CPU time, peak memory and row counts per fetch, transform and
+render stage, written as one JSON file per run.
+
+Usage:
+    python _instrumentation.py                # where time goes, all runs
+    python _instrumentation.py --last 20      # only the 20 latest runs
+
+Scripts opt in explicitly:
+
+    with instrumented_run("250823_fixtureCorrelation") as run:
+        with run.stage("read_schedule", "fetch", cache="miss") as record:
+            df = fbref.read_schedule()
+            record["rows"] = len(df)
+
+and pipelines with ``run_pipeline(..., instrument=True)`` or by setting
+``INSTRUMENT_RUNS=1``. Peak RSS is the process high-water mark when a stage
+ends; `rss_growth_mb` is how much of it the stage itself added.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage
+    resource = None
+
+RUNS_FOLDER = "runs"
+
+
+def _git(*args):
+    try:
+        out = subprocess.run(
+            ["git", "-C", os.path.dirname(os.path.abspath(__file__)), *args],
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+
+def environment():
+    """
+    Commit and machine timings are taken on.
+    """
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "host": platform.node(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def instrumentation_enabled():
+    return os.environ.get("INSTRUMENT_RUNS", "") not in ("", "0")
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return round(peak / (1024**2 if sys.platform == "darwin" else 1024), 1)
+
+
+def row_count(output):
+    return len(output) if isinstance(output, (pd.DataFrame, pd.Series)) else None
+
+
+class Run:
+    """
+    Stage records of one run of a script or pipeline batch.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.stages = []
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    @contextmanager
+    def stage(self, name, kind, cache=None):
+        """
+        Time the block as stage `name` of `kind` ("fetch", "transform",
+        "render"...). The yielded record can be given `rows` or a `cache`
+        outcome ("hit" or "miss") from inside the block.
+        """
+        record = {"stage": name, "kind": kind, "cache": cache, "rows": None}
+        rssBefore = peak_rss_mb()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall, 4)
+            record["cpu_s"] = round(time.process_time() - cpu, 4)
+            record["peak_rss_mb"] = peak_rss_mb()
+            if rssBefore is not None:
+                record["rss_growth_mb"] = round(record["peak_rss_mb"] - rssBefore, 1)
+            self.stages.append(record)
+
+    def to_dict(self):
+        outcomes = [s["cache"] for s in self.stages]
+        return {
+            "run": self.name,
+            "started_at": self.started_at,
+            "argv": sys.argv,
+            **environment(),
+            "render_profile": os.environ.get("RENDER_PROFILE", "print"),
+            "wall_s": round(time.perf_counter() - self._wall, 4),
+            "cpu_s": round(time.process_time() - self._cpu, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "cache": {"hit": outcomes.count("hit"), "miss": outcomes.count("miss")},
+            "stages": self.stages,
+        }
+
+    def write(self, folder=RUNS_FOLDER):
+        os.makedirs(folder, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = f"{folder}/{stamp}_{self.name}.json"
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+@contextmanager
+def instrumented_run(name, folder=RUNS_FOLDER):
+    """
+    A `Run` written to `folder` when the block exits, even on failure.
+    """
+    run = Run(name)
+    try:
+        yield run
+    finally:
+        run.write(folder)
+
+
+def load_stages(folder=RUNS_FOLDER, last=None):
+    """
+    Stage records of the runs in `folder` (optionally only the `last` ones),
+    one row per stage with the run's file, name and start time.
+    """
+    paths = sorted(glob.glob(f"{folder}/*.json"))
+    rows = []
+    for path in paths[-last:] if last else paths:
+        with open(path) as f:
+            run = json.load(f)
+        runId = os.path.basename(path)[:-5]
+        for stage in run["stages"]:
+            rows.append(
+                {
+                    "run_id": runId,
+                    "run": run["run"],
+                    "started_at": run["started_at"],
+                    **stage,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def summarise_stages(stages):
+    """
+    Time, memory and cache outcomes per stage across runs, slowest first,
+    with each stage's share of all recorded wall time.
+    """
+    if stages.empty:
+        return stages
+    stages = stages.assign(hit=stages["cache"] == "hit", miss=stages["cache"] == "miss")
+    summary = stages.groupby(["kind", "stage"]).agg(
+        runs=("run_id", "nunique"),
+        calls=("wall_s", "size"),
+        wall_s=("wall_s", "sum"),
+        mean_wall_s=("wall_s", "mean"),
+        cpu_s=("cpu_s", "sum"),
+        peak_rss_mb=("peak_rss_mb", "max"),
+        mean_rows=("rows", "mean"),
+        hits=("hit", "sum"),
+        misses=("miss", "sum"),
+    )
+    summary["wall_share"] = (summary["wall_s"] / summary["wall_s"].sum()).round(3)
+    return summary.sort_values("wall_s", ascending=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("folder", nargs="?", default=RUNS_FOLDER)
+    parser.add_argument("--last", type=int, default=None, help="latest runs only")
+    args = parser.parse_args()
+
+    stages = load_stages(args.folder, args.last)
+    if stages.empty:
+        sys.exit(f"No runs recorded in {args.folder}")
+    summary = summarise_stages(stages)
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(summary.groupby(level="kind")[["wall_s", "cpu_s"]].sum())
+        print()
+        print(summary.round(3))
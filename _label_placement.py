@@ -0,0 +1,186 @@
+import numpy as np
+
+from collections import defaultdict
+from matplotlib import rcParams
+from matplotlib.collections import LineCollection
+from _commons import glyph_widths, measure_text
+from _table_commons import add_text_batch
+
+# When no spot is free, covering a marker is preferred to covering a label.
+_LABEL_WEIGHT = 100
+
+
+class _BoxGrid:
+    """
+    Uniform grid over display space. Each box is registered in every cell it
+    touches, so a query only looks at boxes in the cells it covers.
+    """
+
+    def __init__(self, cellSize, capacity):
+        self.cellSize = cellSize
+        self.cells = defaultdict(list)
+        self.boxes = np.empty((capacity, 4))
+        self.weights = np.empty(capacity)
+        self.count = 0
+
+    def _cells(self, box):
+        x0, y0, x1, y1 = (int(v // self.cellSize) for v in box)
+        return ((i, j) for i in range(x0, x1 + 1) for j in range(y0, y1 + 1))
+
+    def add(self, box, weight=1):
+        self.boxes[self.count] = box
+        self.weights[self.count] = weight
+        for cell in self._cells(box):
+            self.cells[cell].append(self.count)
+        self.count += 1
+
+    def overlap_costs(self, candidates):
+        """
+        For each candidate box (rows of x0, y0, x1, y1), the summed weight of
+        the registered boxes it overlaps.
+        """
+        region = (*candidates[:, :2].min(axis=0), *candidates[:, 2:].max(axis=0))
+        nearby = [self.cells.get(cell, ()) for cell in self._cells(region)]
+        indices = np.unique(np.fromiter((i for c in nearby for i in c), dtype=int))
+        if not len(indices):
+            return np.zeros(len(candidates))
+        others = self.boxes[indices]
+        hits = (
+            (candidates[:, None, 0] < others[None, :, 2])
+            & (others[None, :, 0] < candidates[:, None, 2])
+            & (candidates[:, None, 1] < others[None, :, 3])
+            & (others[None, :, 1] < candidates[:, None, 3])
+        )
+        return hits @ self.weights[indices]
+
+
+def _candidates(px, py, width, height, gap, levels):
+    """
+    Candidate boxes (x0, y0, x1, y1) around a point, nearest first, and how
+    many lines each one is moved away from the point. Level 0 is right, left,
+    above and below; each further level slides the side boxes up and down and
+    moves the stacked ones away by one more line.
+    """
+    side = gap + width / 2
+    centres, depth = [], []
+    for level in range(levels + 1):
+        stacked = gap + height / 2 + level * height
+        if level == 0:
+            centres += [(side, 0), (-side, 0)]
+        else:
+            slide = level * height
+            centres += [(side, slide), (side, -slide), (-side, slide), (-side, -slide)]
+        centres += [(0, stacked), (0, -stacked)]
+        depth += [level] * (len(centres) - len(depth))
+    cx, cy = np.array([px, py])[:, None] + np.array(centres).T
+    boxes = np.column_stack(
+        [cx - width / 2, cy - height / 2, cx + width / 2, cy + height / 2]
+    )
+    return boxes, np.array(depth)
+
+
+def place_labels(
+    ax,
+    xs,
+    ys,
+    labels,
+    fontsize=8,
+    fontweight="bold",
+    color="black",
+    stroke=None,
+    marker_size=55,
+    obstacles=None,
+    padding=1,
+    levels=5,
+    leader=None,
+    zorder=4,
+):
+    """
+    Annotate points (`xs`, `ys`, in data coordinates) with `labels` without
+    overlaps, as a fast replacement for ``adjustText.adjust_text``.
+
+    Labels are placed in order, so pass the most important ones first. Each
+    one takes the first free spot among a few positions around its point,
+    avoiding markers (`marker_size` as in ``ax.scatter(s=...)``), labels
+    already placed and the axes edges. `obstacles` is an optional ``(xs, ys)``
+    pair of further markers to keep clear, e.g. the unlabelled points.
+
+    Labels with no free spot go where they cover the fewest other labels, then
+    the fewest markers. Labels moved away from their point get a leader line
+    styled by `leader` (LineCollection kwargs).
+
+    Call it once the axes limits and position are final.
+    """
+    labels = [str(label) for label in labels]
+    if not labels:
+        return []
+
+    ax.autoscale_view()
+    toPixels = ax.get_figure().dpi / 72
+    family = tuple(rcParams["font.family"])
+
+    points = ax.transData.transform(np.column_stack([xs, ys]))
+    markers = points
+    if obstacles is not None:
+        extra = ax.transData.transform(np.column_stack(obstacles))
+        markers = np.vstack([points, extra])
+    glyphs = glyph_widths(fontsize, fontweight, family)
+    _, lineHeight = measure_text("lp", fontsize=fontsize, fontweight=fontweight)
+    pad = padding * toPixels
+    height = lineHeight * toPixels + 2 * pad
+    markerHalf = np.sqrt(marker_size) * toPixels / 2
+
+    grid = _BoxGrid(4 * height, len(markers) + len(labels))
+    for px, py in markers:
+        grid.add((px - markerHalf, py - markerHalf, px + markerHalf, py + markerHalf))
+
+    bounds = ax.bbox
+    corners, leaders = [], []
+    for (px, py), label in zip(points, labels):
+        width = glyphs.width(label) * toPixels + 2 * pad
+        boxes, depth = _candidates(px, py, width, height, markerHalf, levels)
+        inside = (
+            (boxes[:, 0] >= bounds.x0)
+            & (boxes[:, 2] <= bounds.x1)
+            & (boxes[:, 1] >= bounds.y0)
+            & (boxes[:, 3] <= bounds.y1)
+        )
+        if inside.any():
+            boxes, depth = boxes[inside], depth[inside]
+            # argmin returns the first minimum, i.e. the preferred free spot.
+            best = int(np.argmin(grid.overlap_costs(boxes)))
+        else:
+            # Nothing fits inside the axes: keep the default spot.
+            best = 0
+        box = boxes[best]
+        grid.add(box, _LABEL_WEIGHT)
+        corners.append((box[0] + pad, box[1] + pad))
+        if depth[best] > 0:
+            nearest = (min(max(px, box[0]), box[2]), min(max(py, box[1]), box[3]))
+            leaders.append([(px, py), nearest])
+
+    toData = ax.transData.inverted()
+    anchors = toData.transform(np.array(corners))
+    artists = add_text_batch(
+        ax,
+        anchors[:, 0],
+        anchors[:, 1],
+        labels,
+        fontsize=fontsize,
+        fontweight=fontweight,
+        color=color,
+        ha="left",
+        va="bottom",
+        family=family,
+        zorder=zorder,
+        stroke=stroke,
+    )
+    if leaders:
+        lines = LineCollection(
+            [toData.transform(line) for line in leaders],
+            zorder=zorder - 1,
+            **(leader or dict(color="gray", linewidth=0.5)),
+        )
+        ax.add_collection(lines, autolim=False)
+        artists.append(lines)
+    return artists
@@ -0,0 +1,105 @@
+"""
+Derived metrics declared once as expressions over flattened FBref columns.
+
+Expressions use ``DataFrame.eval`` syntax; column names that are not valid
+identifiers (``90s``, ``challenges_tkl%``...) go in backticks. A metric may
+refer to other metrics, so shared subexpressions are declared as metrics of
+their own and computed once.
+
+    df = add_metrics(df, ["tkl90", "tklw_share"])
+
+All requested metrics and their dependencies are evaluated in a single
+``DataFrame.eval`` call over the whole frame, through numexpr when it is
+installed.
+"""
+
+import numpy as np
+import re
+
+METRICS = {
+    # Defense
+    "tkl90": "tackles_tkl / `90s`",
+    "tklw90": "tackles_tklw / `90s`",
+    "tklw_share": "tklw90 / tkl90",
+    "int90": "`int` / `90s`",
+    # Shooting
+    "gls90": "standard_gls / `90s`",
+    "xg90": "expected_xg / `90s`",
+    "gls_minus_xg": "standard_gls - expected_xg",
+    # Passing
+    "xa90": "expected_xa / `90s`",
+    "ast_minus_xa": "ast - expected_xa",
+}
+
+_NAME = re.compile(r"`([^`]+)`|\b([A-Za-z_][A-Za-z0-9_]*)\b")
+
+
+def register_metric(name, expression):
+    """
+    Declare (or redefine) a metric for every script of the session.
+    """
+    METRICS[name] = expression
+
+
+def metric_inputs(name):
+    """
+    Column and metric names referenced by a metric's expression.
+    """
+    return [quoted or bare for quoted, bare in _NAME.findall(METRICS[name])]
+
+
+def _resolve(names, columns):
+    """
+    Requested metrics and the metrics they depend on, dependencies first.
+    """
+    ordered, visiting = [], set()
+
+    def visit(name):
+        if name in ordered:
+            return
+        if name in visiting:
+            raise ValueError(f"Metric {name!r} depends on itself")
+        visiting.add(name)
+        for dependency in metric_inputs(name):
+            if dependency in METRICS and dependency not in columns:
+                visit(dependency)
+            elif dependency not in columns:
+                raise KeyError(f"Metric {name!r} needs missing column {dependency!r}")
+        visiting.discard(name)
+        ordered.append(name)
+
+    for name in names:
+        if name not in METRICS:
+            raise KeyError(f"Unknown metric {name!r}")
+        visit(name)
+    return ordered
+
+
+def available_metrics(df):
+    """
+    Names of the registered metrics that can be computed from `df`.
+    """
+    available = []
+    for name in METRICS:
+        try:
+            _resolve([name], set(df.columns))
+        except KeyError:
+            continue
+        available.append(name)
+    return available
+
+
+def add_metrics(df, names=None):
+    """
+    Return `df` with the metrics in `names` (default: every metric its columns
+    allow) added as columns. Division by zero gives NaN rather than inf.
+    """
+    names = available_metrics(df) if names is None else names
+    ordered = _resolve(names, set(df.columns))
+    if not ordered:
+        return df.copy()
+
+    program = "\n".join(f"{name} = {METRICS[name]}" for name in ordered)
+    result = df.eval(program)
+    result[ordered] = result[ordered].replace([np.inf, -np.inf], np.nan)
+    return result
@@ -0,0 +1,258 @@
+"""
+Run visuals declared as DAGs of fetch, transform and render stages.
+
+Usage:
+    python _pipeline.py 250816_table_findOccasionalSmashersInBundesliga.py \
+        250816_table_findOccasionalSmashersInJPL.py
+
+A visual is a `Render` stage whose inputs are other stages:
+
+    schedule = Stage(fetch_schedule, league=LEAGUE, seasons=SEASONS)
+    rows = Stage(team_match_rows, schedule, round_name="Bundesliga")
+    visual = Render(draw_table, Stage(smashers, rows), output=OUTPUT_PATH)
+    run_pipeline([visual])
+
+A stage's key hashes its function's source, its parameters and the keys of
+its inputs, so stages declared identically by several visuals are one node
+of the DAG. Transform keys also hash the shared `_*.py` modules, whose
+helpers they call; fetch keys do not, so code changes never refetch data.
+Outputs are pickled under `PIPELINE_FOLDER` by key: a batch runs each
+distinct stage once, and later batches only rerun stages whose definition
+or upstream changed. Renders go through the render manifest, fingerprinted
+with the content of their inputs, and are skipped when neither the data
+nor the code changed.
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import runpy
+import sys
+import time
+import pandas as pd
+
+from functools import lru_cache
+from _digests import frame_digest
+from _instrumentation import Run, instrumentation_enabled, row_count
+from _render_cache import SHARED_CODE, is_up_to_date, record_render
+from _render_cache import visual_fingerprint
+
+PIPELINE_FOLDER = "fbrefData/pipeline"
+SAVEFIG_KWARGS = dict(
+    facecolor="#eceff4",
+    bbox_inches="tight",
+    pad_inches=0.3,
+    edgecolor="none",
+    transparent=False,
+)
+
+
+def _source(func):
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return f"{func.__module__}.{func.__qualname__}"
+
+
+@lru_cache(maxsize=None)
+def _shared_code_digest():
+    h = hashlib.sha256()
+    for path in SHARED_CODE:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _output_digest(output):
+    if isinstance(output, (pd.DataFrame, pd.Series)):
+        return frame_digest(output)
+    return hashlib.sha256(pickle.dumps(output)).hexdigest()
+
+
+class Stage:
+    """
+    `func(*input outputs, **params)`, evaluated at most once per key.
+    Stages with `cache=False` are recomputed in every batch (still once).
+    """
+
+    def __init__(self, func, *inputs, cache=True, **params):
+        self.func = func
+        self.inputs = inputs
+        self.params = params
+        self.cache = cache
+        h = hashlib.sha256(_source(func).encode())
+        h.update(json.dumps(params, sort_keys=True, default=str).encode())
+        if inputs:
+            h.update(_shared_code_digest().encode())
+        for stage in inputs:
+            h.update(stage.key.encode())
+        self.key = h.hexdigest()[:16]
+
+    @property
+    def kind(self):
+        return "transform" if self.inputs else "fetch"
+
+    def __repr__(self):
+        return f"{self.func.__name__}[{self.key[:8]}]"
+
+
+class Render(Stage):
+    """
+    Stage whose function returns a figure, saved to `output`.
+    """
+
+    def __init__(self, func, *inputs, output, savefig=None, **params):
+        super().__init__(func, *inputs, cache=False, **params)
+        self.output = output
+        self.savefig = {**SAVEFIG_KWARGS, **(savefig or {})}
+
+    @property
+    def kind(self):
+        return "render"
+
+    def fingerprint(self, inputs):
+        """
+        Hash of the render's definition, its input outputs and the shared
+        drawing code.
+        """
+        return visual_fingerprint(
+            [],
+            params={
+                "stage": self.key,
+                "output": self.output,
+                "inputs": [_output_digest(output) for output in inputs],
+            },
+            code_paths=SHARED_CODE,
+        )
+
+
+def build_dag(visuals):
+    """
+    Distinct stages needed by `visuals`, every stage after its inputs.
+    """
+    ordered = {}
+
+    def visit(stage):
+        if stage.key in ordered:
+            return
+        for upstream in stage.inputs:
+            visit(upstream)
+        ordered[stage.key] = stage
+
+    for visual in visuals:
+        visit(visual)
+    return list(ordered.values())
+
+
+class _Batch:
+    def __init__(self, folder, force, run):
+        self.folder = folder
+        self.force = force
+        self.run = run
+        self.outputs = {}
+        self.counts = {"ran": 0, "cached": 0}
+
+    def evaluate(self, stage):
+        if stage.key in self.outputs:
+            return self.outputs[stage.key]
+
+        name, path = stage.func.__name__, f"{self.folder}/{stage.key}.pkl"
+        if stage.cache and not self.force and os.path.exists(path):
+            with self.run.stage(name, stage.kind, cache="hit") as record:
+                output = pd.read_pickle(path)
+            self.counts["cached"] += 1
+        else:
+            inputs = [self.evaluate(upstream) for upstream in stage.inputs]
+            outcome = "miss" if stage.cache else None
+            with self.run.stage(name, stage.kind, cache=outcome) as record:
+                output = stage.func(*inputs, **stage.params)
+                if stage.cache:
+                    os.makedirs(self.folder, exist_ok=True)
+                    pd.to_pickle(output, path)
+            self.counts["ran"] += 1
+        record["rows"] = row_count(output)
+        self.outputs[stage.key] = output
+        return output
+
+    def render(self, visual):
+        # Inputs come first: a refreshed fetch cache must redraw the image.
+        inputs = [self.evaluate(upstream) for upstream in visual.inputs]
+        fingerprint = visual.fingerprint(inputs)
+        if not self.force and is_up_to_date(visual.output, fingerprint):
+            with self.run.stage(visual.func.__name__, "render", cache="hit"):
+                print(f"{visual.output} is up to date, skipping render")
+            return
+
+        import matplotlib.pyplot as plt
+
+        fig = self.evaluate(visual)
+        os.makedirs(os.path.dirname(visual.output) or ".", exist_ok=True)
+        with self.run.stage("savefig", "render"):
+            fig.savefig(visual.output, **visual.savefig)
+        plt.close(fig)
+        upstream = build_dag([visual])[:-1]
+        record_render(
+            visual.output,
+            fingerprint,
+            inputs={s.func.__name__: f"{self.folder}/{s.key}.pkl" for s in upstream},
+        )
+
+
+def run_pipeline(
+    visuals, folder=PIPELINE_FOLDER, force=False, instrument=None, name=None
+):
+    """
+    Render `visuals` as one DAG and return ``{output: (seconds, error)}``.
+
+    `force` ignores stage caches and the render manifest. A failing visual is
+    reported and does not stop the others. With `instrument` (default: the
+    INSTRUMENT_RUNS variable) stage timings are written as a run named
+    `name` (default: the running script), see `_instrumentation`.
+    """
+    dag = build_dag(visuals)
+    declared = sum(len(build_dag([v])) for v in visuals)
+    print(f"{len(visuals)} visuals, {len(dag)} distinct stages ({declared} declared)")
+
+    name = name or os.path.splitext(os.path.basename(sys.argv[0]))[0] or "pipeline"
+    batch = _Batch(folder, force, Run(name))
+    results = {}
+    for visual in visuals:
+        start = time.perf_counter()
+        try:
+            batch.render(visual)
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"{visual.output}: failed ({error})")
+        results[visual.output] = (time.perf_counter() - start, error)
+
+    print(
+        f"stages run: {batch.counts['ran']}, loaded from cache: {batch.counts['cached']}"
+    )
+    if instrumentation_enabled() if instrument is None else instrument:
+        print(f"timings written to {batch.run.write()}")
+    return results
+
+
+def collect_visuals(script):
+    """
+    The `VISUALS` list declared by a visual script, without running it.
+    """
+    scriptDir = os.path.dirname(os.path.abspath(script))
+    if scriptDir not in sys.path:
+        sys.path.insert(0, scriptDir)
+    return runpy.run_path(script, run_name="_pipeline_spec")["VISUALS"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("scripts", nargs="+", help="scripts declaring VISUALS")
+    parser.add_argument("--force", action="store_true", help="ignore all caches")
+    args = parser.parse_args()
+
+    visuals = [v for script in args.scripts for v in collect_visuals(script)]
+    results = run_pipeline(visuals, force=args.force)
+    sys.exit(1 if any(error for _, error in results.values()) else 0)
@@ -0,0 +1,148 @@
+"""
+Player name index over every stored player table, for exact and fuzzy
+lookups that ignore accents, case and name order.
+
+    index = load_player_index()
+    index.rows("yeimar gomez andrade")   # every stored row of that player
+    index.search("Gomes Andrade")        # [("Yeimar Gómez Andrade", 0.71), ...]
+"""
+
+import glob
+import heapq
+import os
+import re
+import unicodedata
+import pandas as pd
+
+from collections import Counter, defaultdict
+from functools import lru_cache
+from _fbref_commons import FBREF_FOLDER
+
+# Stored tables the index covers by default: wide player-season tables and
+# lineup tables, one file per league-season.
+PLAYER_TABLE_PATTERNS = ["*_players.parquet", "*_lineups.parquet"]
+
+_SEPARATORS = re.compile(r"[\s\-'.’]+")
+
+
+@lru_cache(maxsize=None)
+def normalise_name(name):
+    """
+    Accent-folded, case-folded name with its tokens sorted, so "Gómez
+    Andrade, Yeimar" and "yeimar gomez-andrade" give the same key.
+    """
+    decomposed = unicodedata.normalize("NFKD", str(name))
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    tokens = _SEPARATORS.split(folded.casefold().replace(",", " "))
+    return " ".join(sorted(t for t in tokens if t))
+
+
+def same_player(names, name):
+    """
+    Boolean mask of the entries of `names` (a Series) that are `name`, up to
+    accents, case and token order.
+    """
+    return names.map(normalise_name) == normalise_name(name)
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerIndex:
+    """
+    Hash map from normalised name to the stored rows of that player, plus a
+    trigram index over the normalised names for fuzzy search.
+    """
+
+    def __init__(self):
+        self.frames = {}
+        self.rows_by_key = defaultdict(list)
+        self.names_by_key = defaultdict(set)
+        self.keys_by_trigram = defaultdict(set)
+        self.trigram_counts = {}
+
+    def add_frame(self, df, source, player_col="player"):
+        """
+        Index the rows of `df` under `source` (e.g. the table's path).
+        """
+        self.frames[source] = df
+        for name, positions in df.groupby(player_col, sort=False).indices.items():
+            key = normalise_name(name)
+            if key not in self.names_by_key:
+                trigrams = _trigrams(key)
+                for trigram in trigrams:
+                    self.keys_by_trigram[trigram].add(key)
+                self.trigram_counts[key] = len(trigrams)
+            self.names_by_key[key].add(name)
+            self.rows_by_key[key].append((source, positions))
+
+    def __contains__(self, name):
+        return normalise_name(name) in self.rows_by_key
+
+    def names(self, name):
+        """
+        Spellings stored for `name`.
+        """
+        return sorted(self.names_by_key.get(normalise_name(name), ()))
+
+    def rows(self, name):
+        """
+        Every stored row of `name`, with the table it came from in `source`.
+        """
+        hits = self.rows_by_key.get(normalise_name(name), [])
+        if not hits:
+            return pd.DataFrame()
+        parts = [
+            self.frames[source].iloc[positions].assign(source=source)
+            for source, positions in hits
+        ]
+        return pd.concat(parts, ignore_index=True)
+
+    def search(self, query, limit=5, min_score=0.3):
+        """
+        Stored players whose names look like `query`, best first, as
+        ``(name, score)`` pairs. The score is the Dice similarity of the
+        normalised names' trigrams (1 for an exact match).
+        """
+        key = normalise_name(query)
+        queryTrigrams = _trigrams(key)
+        shared = Counter()
+        for trigram in queryTrigrams:
+            shared.update(self.keys_by_trigram.get(trigram, ()))
+
+        size = len(queryTrigrams)
+        scored = (
+            (2 * count / (size + self.trigram_counts[candidate]), candidate)
+            for candidate, count in shared.items()
+        )
+        best = heapq.nlargest(limit, (s for s in scored if s[0] >= min_score))
+        return [
+            (min(self.names_by_key[candidate]), round(score, 3))
+            for score, candidate in best
+        ]
+
+
+def stored_player_tables(folder=FBREF_FOLDER):
+    paths = []
+    for pattern in PLAYER_TABLE_PATTERNS:
+        paths += glob.glob(os.path.join(folder, pattern))
+    return sorted(paths)
+
+
+@lru_cache(maxsize=4)
+def _load_index(paths, mtimes):
+    index = PlayerIndex()
+    for path in paths:
+        index.add_frame(pd.read_parquet(path), source=path)
+    return index
+
+
+def load_player_index(folder=FBREF_FOLDER):
+    """
+    Index of every stored player table under `folder`. It is built once per
+    session and rebuilt only when a table is added or rewritten.
+    """
+    paths = tuple(stored_player_tables(folder))
+    return _load_index(paths, tuple(os.path.getmtime(p) for p in paths))
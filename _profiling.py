@@ -0,0 +1,309 @@
+"""
+Profile a whole visual and write a flamegraph next to its image.
+
+Usage:
+    python _profiling.py 250823_sorare_fixtureCorrelation.py
+    python _profiling.py 250823_sorare_fixtureCorrelation.py --interval 0.002
+    python _profiling.py 250823_sorare_fixtureCorrelation.py --cprofile
+
+The script runs under a sampling profiler. For every image it saves,
+``<image>.collapsed.txt`` (one ``frame;frame;... count`` line per stack)
+and ``<image>.flame.svg`` are written beside it; runs that save nothing
+write them under `PROFILES_FOLDER`. Frames are coloured by what they spend
+time in: pandas, matplotlib, numpy, network I/O, this repo's code or other
+libraries, and the summary printed at the end shares time out the same way
+and lists the library calls from our code that cost the most, such as
+``DataFrame.apply`` or ``Axes.text``.
+"""
+
+import argparse
+import html
+import os
+import runpy
+import sys
+import threading
+import time
+
+from collections import Counter
+from contextlib import contextmanager
+
+PROFILES_FOLDER = "profiles"
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Checked in order: a frame in socket.py is network I/O even when it runs
+# inside soccerdata or urllib.
+CATEGORIES = [
+    ("network", ("socket.py", "ssl.py", "/http/", "urllib", "requests/", "selenium")),
+    ("matplotlib", ("matplotlib/",)),
+    ("pandas", ("pandas/",)),
+    ("numpy", ("numpy/",)),
+]
+COLORS = {
+    "network": "#e45756",
+    "matplotlib": "#f58518",
+    "pandas": "#4c78a8",
+    "numpy": "#54a24b",
+    "repo": "#b279a2",
+    "other": "#bab0ac",
+}
+
+
+def frame_category(filename, roots=(REPO_DIR,)):
+    """
+    Category of code in `filename`; files under `roots` are ``"repo"``.
+    """
+    for category, markers in CATEGORIES:
+        if any(marker in filename for marker in markers):
+            return category
+    if filename.startswith(roots):
+        return "repo"
+    return "other"
+
+
+def _short_path(filename):
+    for marker in ("site-packages/", "/lib/python"):
+        if marker in filename:
+            tail = filename.split(marker, 1)[1]
+            return tail.split("/", 1)[1] if marker == "/lib/python" else tail
+    return os.path.basename(filename)
+
+
+class SamplingProfiler:
+    """
+    Samples the call stack of the thread that starts it every `interval`
+    seconds from a background thread. Stacks start below the runpy frames
+    when the code runs through `runpy`; code under `roots` counts as ours.
+    """
+
+    def __init__(self, interval=0.005, roots=(REPO_DIR,)):
+        self.interval = interval
+        self.roots = tuple(roots)
+        self.stacks = Counter()
+        self.categories = {}
+        self._labels = {}
+        self._stop = threading.Event()
+
+    def _label(self, frame):
+        code = frame.f_code
+        category = self._labels.get(code)
+        if category is None:
+            category = frame_category(os.path.abspath(code.co_filename), self.roots)
+            self._labels[code] = category
+        label = f"{code.co_name} ({_short_path(code.co_filename)}"
+        # Line numbers only for our own code, to tell statements apart.
+        label += f":{frame.f_lineno})" if category == "repo" else ")"
+        self.categories[label] = category
+        return label
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread)
+            stack = []
+            while frame is not None and "runpy" not in frame.f_code.co_filename:
+                stack.append(self._label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.get_ident()
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+        self.elapsed = time.perf_counter() - self._started
+
+
+def write_collapsed(stacks, path):
+    with open(path, "w") as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+
+def write_flamegraph(stacks, categories, path, title="", width=1200, row=16):
+    """
+    SVG flamegraph of collapsed `stacks`, root at the bottom, frames
+    coloured by category and with their share of samples on hover.
+    """
+    tree = {"children": {}, "count": 0}
+    for stack, count in stacks.items():
+        node = tree
+        node["count"] += count
+        for label in stack.split(";"):
+            node = node["children"].setdefault(label, {"children": {}, "count": 0})
+            node["count"] += count
+
+    def depth(node):
+        return 1 + max(map(depth, node["children"].values()), default=0)
+
+    total = max(tree["count"], 1)
+    height = (depth(tree) + 1) * row + 24
+    rects = []
+
+    def draw(label, node, x, level):
+        w = node["count"] / total * width
+        if w < 0.3:
+            return
+        y = height - (level + 1) * row
+        color = COLORS[categories.get(label, "other")]
+        share = node["count"] / total * 100
+        text = html.escape(label[: int(w / 7)]) if w > 21 else ""
+        rects.append(
+            f"<g><title>{html.escape(label)} ({share:.1f}%)</title>"
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}" '
+            f'fill="{color}"/><text x="{x + 2:.1f}" y="{y + row - 4}">{text}</text></g>'
+        )
+        for child, grandchild in node["children"].items():
+            draw(child, grandchild, x, level + 1)
+            x += grandchild["count"] / total * width
+
+    x = 0.0
+    for label, node in tree["children"].items():
+        draw(label, node, x, 0)
+        x += node["count"] / total * width
+
+    legend = " ".join(
+        f'<tspan fill="{c}">■ {name}</tspan>' for name, c in COLORS.items()
+    )
+    with open(path, "w") as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+            f'height="{height}" font-family="monospace" font-size="11">'
+            f'<text x="4" y="14">{html.escape(title)} {legend}</text>'
+            + "".join(rects)
+            + "</svg>"
+        )
+
+
+def summarise(stacks, categories, elapsed, top=10):
+    """
+    Seconds per category (of each sample's innermost frame, network I/O
+    counted wherever it appears in the stack) and the costliest library
+    calls made directly from this repo's code.
+    """
+    total = max(sum(stacks.values()), 1)
+    perCategory, calls = Counter(), Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        kinds = [categories.get(f, "other") for f in frames]
+        perCategory["network" if "network" in kinds else kinds[-1]] += count
+        for caller, callee, kind in zip(frames, frames[1:], kinds[1:]):
+            if categories.get(caller) == "repo" and kind != "repo":
+                calls[callee] += count
+                break
+
+    seconds = lambda n: n / total * elapsed
+    lines = [f"{elapsed:.2f}s, {total} samples"]
+    for category, count in perCategory.most_common():
+        lines.append(f"  {category:<11} {seconds(count):7.2f}s {count / total:6.1%}")
+    lines.append("Costliest library calls from repo code:")
+    for call, count in calls.most_common(top):
+        lines.append(f"  {seconds(count):7.2f}s {count / total:6.1%}  {call}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def saved_images():
+    """
+    Collect the paths of every image saved with `Figure.savefig` in the
+    block (pyplot's savefig included).
+    """
+    from matplotlib.figure import Figure
+
+    paths, original = [], Figure.savefig
+
+    def savefig(self, fname, *args, **kwargs):
+        if isinstance(fname, (str, os.PathLike)):
+            paths.append(os.fspath(fname))
+        return original(self, fname, *args, **kwargs)
+
+    Figure.savefig = savefig
+    try:
+        yield paths
+    finally:
+        Figure.savefig = original
+
+
+def _run_script(script):
+    scriptDir = os.path.dirname(os.path.abspath(script))
+    if scriptDir not in sys.path:
+        sys.path.insert(0, scriptDir)
+    sys.argv = [script]
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise
+
+
+def _outputs(images, script, suffix):
+    if images:
+        return [f"{os.path.splitext(p)[0]}{suffix}" for p in dict.fromkeys(images)]
+    os.makedirs(PROFILES_FOLDER, exist_ok=True)
+    name = os.path.splitext(os.path.basename(script))[0]
+    return [f"{PROFILES_FOLDER}/{name}{suffix}"]
+
+
+def profile_script(script, interval=0.005):
+    """
+    Run `script` under the sampling profiler and write its collapsed stacks
+    and flamegraph next to every image it saved. Returns the summary.
+    """
+    scriptDir = os.path.dirname(os.path.abspath(script))
+    profiler = SamplingProfiler(interval, (REPO_DIR, scriptDir))
+    with saved_images() as images:
+        profiler.start()
+        try:
+            _run_script(script)
+        finally:
+            profiler.stop()
+
+    title = f"{os.path.basename(script)}: {profiler.elapsed:.2f}s"
+    for base in _outputs(images, script, ""):
+        write_collapsed(profiler.stacks, f"{base}.collapsed.txt")
+        write_flamegraph(
+            profiler.stacks, profiler.categories, f"{base}.flame.svg", title
+        )
+        print(f"flamegraph written to {base}.flame.svg")
+    return summarise(profiler.stacks, profiler.categories, profiler.elapsed)
+
+
+def cprofile_script(script):
+    """
+    Run `script` under cProfile, save the stats beside its images (readable
+    with `pstats` or snakeviz) and return the top functions by cumulative time.
+    """
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    with saved_images() as images:
+        profiler.enable()
+        try:
+            _run_script(script)
+        finally:
+            profiler.disable()
+
+    for path in _outputs(images, script, ".prof"):
+        profiler.dump_stats(path)
+        print(f"cProfile stats written to {path}")
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(25)
+    return out.getvalue()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("script", help="visual script to profile")
+    parser.add_argument("--interval", type=float, default=0.005, help="seconds")
+    parser.add_argument("--cprofile", action="store_true", help="use cProfile")
+    args = parser.parse_args()
+
+    if args.cprofile:
+        print(cprofile_script(args.script))
+    else:
+        print(profile_script(args.script, args.interval))
@@ -0,0 +1,154 @@
+"""
+SQL over the partitioned FBref store (see `_store`), run by DuckDB.
+
+Usage:
+    python _query.py "SELECT league, count(*) FROM schedule GROUP BY league"
+    python _query.py --clean-sheet-wins --seasons 2021 2122 2223 2324 2425
+
+Every stored table is a view over its Parquet partitions: DuckDB only
+opens the partitions a query's league and season predicates select, only
+reads the columns it uses, and streams the files through its aggregations,
+so a full-history question never holds the whole store in memory. Results
+come back as DataFrames.
+
+DuckDB is imported on first query: ``pip install duckdb``.
+"""
+
+import argparse
+import os
+import re
+import pandas as pd
+
+from _fbref_commons import SCORE_PATTERN
+from _schema import SCHEMAS, apply_schema
+from _store import STORE_FOLDER
+
+# DuckDB sizes, e.g. "4GB" or "512 MiB".
+MEMORY_LIMIT_PATTERN = re.compile(r"\d+(\.\d+)?\s*([KMGT]i?B|bytes)", re.IGNORECASE)
+
+
+def connect(folder=STORE_FOLDER, memory_limit=None):
+    """
+    In-memory DuckDB connection with a view per table stored in `folder`.
+    Raises ValueError when `memory_limit` is not a size like "4GB".
+    """
+    if memory_limit and not MEMORY_LIMIT_PATTERN.fullmatch(str(memory_limit)):
+        raise ValueError(f"Invalid memory limit {memory_limit!r}, e.g. '4GB'")
+
+    import duckdb
+
+    con = duckdb.connect()
+    if memory_limit:
+        con.execute(f"SET memory_limit = '{memory_limit}'")
+    for table in SCHEMAS:
+        if not os.path.isdir(f"{folder}/{table}"):
+            continue
+        # Partition values stay text, as in the store: season '2425'.
+        con.execute(
+            f"CREATE VIEW {table} AS SELECT * FROM read_parquet("
+            f"'{folder}/{table}/*/*/part.parquet', hive_partitioning = true, "
+            f"hive_types = {{'league': VARCHAR, 'season': VARCHAR}}, "
+            f"union_by_name = true)"
+        )
+    return con
+
+
+def query(sql, params=None, folder=STORE_FOLDER, con=None):
+    """
+    Result of `sql` over the stored tables as a DataFrame.
+    """
+    con = con or connect(folder)
+    return con.execute(sql, params or []).df()
+
+
+def _in(column, values, params):
+    params.extend(map(str, values))
+    return f"{column} IN ({', '.join('?' * len(values))})"
+
+
+def scan(
+    table, leagues=None, seasons=None, columns=None, where=None, folder=STORE_FOLDER
+):
+    """
+    Rows of `table`, like `_store.read_table`, with an optional SQL `where`
+    clause also evaluated in the scan. Returned in the `_schema` dtypes.
+    """
+    params, predicates = [], []
+    if leagues is not None:
+        predicates.append(_in("league", leagues, params))
+    if seasons is not None:
+        predicates.append(_in("season", seasons, params))
+    if where:
+        predicates.append(f"({where})")
+
+    select = ", ".join(f'"{c}"' for c in ["league", "season", *(columns or [])])
+    sql = f"SELECT {select if columns else '*'} FROM {table}"
+    if predicates:
+        sql += " WHERE " + " AND ".join(predicates)
+    df = query(sql, params, folder)
+    return apply_schema(df, table, validate=columns is None)
+
+
+def clean_sheet_wins(min_goals=2, leagues=None, seasons=None, folder=STORE_FOLDER):
+    """
+    Per league, team and season, matches won scoring `min_goals` or more
+    without conceding, most first. Scores are read as `separate_score` reads
+    them; those that do not parse are left out.
+    """
+    params, filters = [], ""
+    if leagues is not None:
+        filters += " AND " + _in("league", leagues, params)
+    if seasons is not None:
+        filters += " AND " + _in("season", seasons, params)
+    sql = f"""
+        WITH goals AS (
+            SELECT
+                league, season, home_team, away_team,
+                TRY_CAST(regexp_extract(score, '{SCORE_PATTERN}', 1) AS INTEGER)
+                    AS home_goals,
+                TRY_CAST(regexp_extract(score, '{SCORE_PATTERN}', 2) AS INTEGER)
+                    AS away_goals
+            FROM schedule
+            WHERE score IS NOT NULL{filters}
+        )
+        SELECT league, team, season, count(*) AS wins
+        FROM (
+            SELECT league, season, home_team AS team FROM goals
+            WHERE home_goals >= ? AND away_goals = 0
+            UNION ALL
+            SELECT league, season, away_team AS team FROM goals
+            WHERE away_goals >= ? AND home_goals = 0
+        )
+        GROUP BY league, team, season
+        ORDER BY wins DESC, league, team, season
+    """
+    return query(sql, params + [min_goals, min_goals], folder)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("sql", nargs="?", help="query over the stored tables")
+    parser.add_argument("--store", default=STORE_FOLDER)
+    parser.add_argument("--clean-sheet-wins", action="store_true")
+    parser.add_argument("--min-goals", type=int, default=2)
+    parser.add_argument("--leagues", nargs="+", default=None)
+    parser.add_argument("--seasons", nargs="+", default=None)
+    parser.add_argument("--top", type=int, default=30)
+    args = parser.parse_args()
+
+    if args.clean_sheet_wins:
+        result = clean_sheet_wins(
+            args.min_goals, args.leagues, args.seasons, args.store
+        )
+        result = (
+            result.groupby(["league", "team"])["wins"]
+            .sum()
+            .sort_values(ascending=False)
+            .reset_index()
+        )
+    elif args.sql:
+        result = query(args.sql, folder=args.store)
+    else:
+        parser.error("give a query or --clean-sheet-wins")
+    with pd.option_context("display.width", 160):
+        print(result.head(args.top).to_string(index=False))
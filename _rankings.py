@@ -0,0 +1,160 @@
+"""
+Per-90 rates, percentiles, z-scores and composite scores for FBref player
+season stats.
+
+Rankings are computed for every numeric column at once, within groups of
+comparable players (league, season and primary position by default), and
+cached, so queries like "top 15% of tacklers in every league" are lookups.
+"""
+
+import hashlib
+import json
+import os
+import pandas as pd
+
+from collections import OrderedDict
+from _fbref_commons import flattenMultiCol
+from _digests import frame_digest
+
+RANKINGS_FOLDER = "fbrefData/rankings"
+GROUP_KEYS = ["league", "season", "primary_pos"]
+# Full matches played: "90s" in most of FBref's stat tables, "playing
+# time_90s" once the standard table's columns are flattened.
+PLAYING_TIME = "90s"
+# Appearances and minutes ("playing time_mp", "starts_mn/start", "min"...):
+# what the rates are computed over, not stats to rank.
+PLAYING_TIME_COLUMNS = {"90s", "mp", "min", "starts"}
+PLAYING_TIME_PREFIXES = ("playing time_", "starts_", "subs_")
+# Rankings kept in memory, least recently used dropped first.
+MEMORY_SIZE = 8
+
+# Columns that describe the player rather than their output.
+_METADATA = {"age", "born"}
+# Ratios, averages and per-shot or per-90 figures are already rates.
+_RATE_MARKERS = ("%", "/", "dist", "avg", "per 90")
+
+_MEMORY = OrderedDict()
+
+
+def _prepare(df):
+    df = df.reset_index() if not isinstance(df.index, pd.RangeIndex) else df.copy()
+    df.columns = flattenMultiCol(df.columns)
+    if "pos" in df.columns:
+        df["primary_pos"] = df["pos"].fillna("").str.split(",").str[0]
+    return df
+
+
+def playing_time_column(columns):
+    """
+    The full-matches-played column among flattened FBref `columns`.
+    """
+    for column in columns:
+        if column == PLAYING_TIME or str(column).endswith(f"_{PLAYING_TIME}"):
+            return column
+    raise KeyError(f"No {PLAYING_TIME!r} playing time column")
+
+
+def is_playing_time(column):
+    """
+    Whether a flattened FBref column counts appearances or minutes.
+    """
+    column = str(column)
+    return column in PLAYING_TIME_COLUMNS or column.startswith(PLAYING_TIME_PREFIXES)
+
+
+def stat_columns(df):
+    """
+    Numeric stat columns of a flattened player-stats frame, split into counts
+    (which get a per-90 rate) and rates (ranked as they are). Metadata and
+    playing-time columns are neither.
+    """
+    numeric = [
+        c
+        for c in df.select_dtypes("number").columns
+        if c not in _METADATA and not is_playing_time(c)
+    ]
+    rates = [c for c in numeric if any(m in c for m in _RATE_MARKERS)]
+    counts = [c for c in numeric if c not in rates]
+    return counts, rates
+
+
+def rank_players(df, group_keys=GROUP_KEYS, min_90s=0):
+    """
+    Add, for every numeric stat, a percentile (`<stat>_pct`, 0-1) and a
+    z-score (`<stat>_z`) within `group_keys`. Count stats are first turned
+    into per-90 rates (`<stat>_p90`), which are what gets ranked.
+
+    Players with fewer than `min_90s` full matches are dropped before
+    ranking, so they do not dilute the groups.
+    """
+    df = _prepare(df)
+    nineties = playing_time_column(df.columns)
+    if min_90s:
+        df = df[df[nineties] >= min_90s]
+    counts, rates = stat_columns(df)
+
+    per90 = df[counts].div(df[nineties].where(df[nineties] > 0), axis=0)
+    per90.columns = [f"{c}_p90" for c in counts]
+    values = pd.concat([per90, df[rates]], axis=1)
+
+    keys = [df[k] for k in group_keys if k in df.columns] or [pd.Series(0, df.index)]
+    groups = values.groupby(keys, sort=False)
+    pct = groups.rank(pct=True)
+    z = (values - groups.transform("mean")) / groups.transform("std")
+    pct.columns = [f"{c.removesuffix('_p90')}_pct" for c in values.columns]
+    z.columns = [f"{c.removesuffix('_p90')}_z" for c in values.columns]
+
+    return pd.concat([df, per90, pct, z], axis=1)
+
+
+def cached_rankings(df, group_keys=GROUP_KEYS, min_90s=0, folder=RANKINGS_FOLDER):
+    """
+    `rank_players` memoised in memory and on disk, keyed by the content of
+    `df` and the ranking parameters.
+    """
+    params = json.dumps([list(group_keys), min_90s])
+    key = hashlib.sha256((frame_digest(df) + params).encode()).hexdigest()[:16]
+    if key in _MEMORY:
+        _MEMORY.move_to_end(key)
+        return _MEMORY[key]
+
+    path = f"{folder}/{key}.pkl"
+    if os.path.exists(path):
+        ranked = pd.read_pickle(path)
+    else:
+        ranked = rank_players(df, group_keys, min_90s)
+        os.makedirs(folder, exist_ok=True)
+        ranked.to_pickle(path)
+    _MEMORY[key] = ranked
+    if len(_MEMORY) > MEMORY_SIZE:
+        _MEMORY.popitem(last=False)
+    return ranked
+
+
+def composite_score(ranked, weights, name="composite", group_keys=GROUP_KEYS):
+    """
+    Weighted sum of z-scores, e.g. ``{"tackles_tkl": 0.5, "challenges_tkl%":
+    0.5}``, with its own percentile within the same groups.
+    """
+    ranked = ranked.copy()
+    ranked[f"{name}_z"] = sum(ranked[f"{stat}_z"] * w for stat, w in weights.items())
+    keys = [ranked[k] for k in group_keys if k in ranked.columns]
+    keys = keys or [pd.Series(0, ranked.index)]
+    ranked[f"{name}_pct"] = ranked[f"{name}_z"].groupby(keys, sort=False).rank(pct=True)
+    return ranked
+
+
+def top_share(ranked, stat, share):
+    """
+    Players in the top `share` (0-1) of their group for `stat`, best first.
+    """
+    top = ranked[ranked[f"{stat}_pct"] > 1 - share]
+    return top.sort_values(f"{stat}_pct", ascending=False)
+
+
+def top_per_group(ranked, stat, n, by="team"):
+    """
+    The `n` best players for `stat` within each `by` group.
+    """
+    column = f"{stat}_pct" if f"{stat}_pct" in ranked.columns else stat
+    return ranked.sort_values(column, ascending=False).groupby(by, sort=False).head(n)
@@ -0,0 +1,98 @@
+"""
+Skip re-rendering visuals whose inputs did not change.
+
+A fingerprint covers the frame a visual plots, its parameters, the active
+render profile and the source of the script plus the shared `_*.py` modules.
+`imgs/manifest.json` records, for every image, the fingerprint and inputs
+that produced it.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sys
+import pandas as pd
+
+from contextlib import contextmanager
+from datetime import datetime
+from _digests import frame_digest
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+MANIFEST_PATH = "imgs/manifest.json"
+SHARED_CODE = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "_*.py")))
+
+
+def visual_fingerprint(frames, params=None, code_paths=None):
+    """
+    Hash of everything that determines a visual's output image.
+
+    `frames` is a DataFrame or a list of them. `code_paths` defaults to the
+    running script (when there is one: not in a REPL, notebook or
+    ``python -c``) plus every shared `_*.py` module.
+    """
+    if isinstance(frames, (pd.DataFrame, pd.Series)):
+        frames = [frames]
+    if code_paths is None:
+        script = getattr(sys.modules["__main__"], "__file__", None)
+        code_paths = ([script] if script else []) + SHARED_CODE
+
+    h = hashlib.sha256()
+    for frame in frames:
+        h.update(frame_digest(frame).encode())
+    h.update(json.dumps(params, sort_keys=True, default=str).encode())
+    h.update(os.environ.get("RENDER_PROFILE", "print").encode())
+    for path in code_paths:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+@contextmanager
+def _locked_manifest(manifest_path):
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    with open(f"{manifest_path}.lock", "w") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = load_manifest(manifest_path)
+        yield manifest
+        tmpPath = f"{manifest_path}.tmp"
+        with open(tmpPath, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmpPath, manifest_path)
+
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def is_up_to_date(output_path, fingerprint, manifest_path=MANIFEST_PATH):
+    """
+    True if `output_path` exists and was rendered from `fingerprint`.
+    """
+    entry = load_manifest(manifest_path).get(output_path)
+    return (
+        entry is not None
+        and entry["fingerprint"] == fingerprint
+        and os.path.exists(output_path)
+    )
+
+
+def record_render(output_path, fingerprint, inputs=None, manifest_path=MANIFEST_PATH):
+    """
+    Store which fingerprint and inputs (cache files, parameters...) produced
+    `output_path`.
+    """
+    with _locked_manifest(manifest_path) as manifest:
+        manifest[output_path] = {
+            "fingerprint": fingerprint,
+            "inputs": inputs or {},
+            "rendered_at": datetime.now().isoformat(timespec="seconds"),
+        }
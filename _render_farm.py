@@ -0,0 +1,141 @@
+"""
+Render a batch of visuals across a process pool.
+
+Usage:
+    python _render_farm.py 250816_table_findOccasionalSmashersInBundesliga.py \
+        250816_table_findOccasionalSmashersInJPL.py --processes 4 --profile draft
+
+From Python, jobs can also be ``(function, kwargs)`` pairs. Large frames that
+several jobs need are passed once through `shared` and read back inside the
+job with `get_shared(name)`, instead of being pickled into every job.
+"""
+
+import argparse
+import os
+import runpy
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from matplotlib import font_manager
+from _commons import RENDER_PROFILES, fetch_logo
+
+_SHARED = {}
+
+
+def get_shared(name):
+    """
+    Return a frame registered through `render_jobs(..., shared=...)`.
+    """
+    return _SHARED[name]
+
+
+def init_worker(shared_paths=None, logo_urls=(), font_family="Monospace"):
+    """
+    One-off setup of a render process: Agg backend, rcParams, font lookup,
+    logo cache and shared frames. Also usable directly for in-process runs.
+    """
+    matplotlib.use("Agg")
+    plt.rcParams["font.family"] = font_family
+    for weight in ["normal", "bold"]:
+        font_manager.findfont(
+            font_manager.FontProperties(family=font_family, weight=weight)
+        )
+
+    for url in logo_urls:
+        try:
+            fetch_logo(url)
+        except OSError as e:
+            print(f"Failed to prefetch logo {url}: {e}")
+
+    for name, path in (shared_paths or {}).items():
+        _SHARED[name] = pd.read_pickle(path)
+
+
+def _job_label(job):
+    if isinstance(job, str):
+        return job
+    func, kwargs = job
+    args = ", ".join(f"{k}={v!r}" for k, v in kwargs.items())
+    return f"{func.__name__}({args})"
+
+
+def _run_job(job):
+    start = time.perf_counter()
+    try:
+        if isinstance(job, str):
+            scriptDir = os.path.dirname(os.path.abspath(job))
+            if scriptDir not in sys.path:
+                sys.path.insert(0, scriptDir)
+            runpy.run_path(job, run_name="__main__")
+        else:
+            func, kwargs = job
+            func(**kwargs)
+        error = None
+    except SystemExit as e:
+        # Scripts may exit early, e.g. when their output is already up to date.
+        error = None if e.code in (None, 0) else f"SystemExit: {e.code}"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        plt.close("all")
+    return time.perf_counter() - start, error
+
+
+def render_jobs(jobs, shared=None, logo_urls=(), processes=None):
+    """
+    Render `jobs` in parallel and return one ``(label, seconds, error)``
+    per job, in the order of `jobs`.
+
+    Each job is either the path of a visual script or a ``(function, kwargs)``
+    pair whose function is importable by the workers. `shared` maps names to
+    DataFrames; they are written to disk once and loaded once per worker.
+    """
+    jobs = list(jobs)
+    with tempfile.TemporaryDirectory() as tmpDir:
+        sharedPaths = {}
+        for name, frame in (shared or {}).items():
+            sharedPaths[name] = os.path.join(tmpDir, f"{name}.pkl")
+            frame.to_pickle(sharedPaths[name])
+
+        results = [None] * len(jobs)
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=init_worker,
+            initargs=(sharedPaths, tuple(logo_urls)),
+        ) as pool:
+            # By position: labels of identical jobs or same-named scripts
+            # in different folders can clash.
+            futures = {pool.submit(_run_job, job): i for i, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                i = futures[future]
+                label = _job_label(jobs[i])
+                seconds, error = future.result()
+                results[i] = (label, seconds, error)
+                status = f"failed ({error})" if error else "done"
+                print(f"{label}: {status} in {seconds:.1f}s")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("scripts", nargs="+", help="visual scripts to render")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--profile", choices=list(RENDER_PROFILES), default=None)
+    args = parser.parse_args()
+
+    # Workers inherit the environment, so this selects the profile for all jobs.
+    if args.profile:
+        os.environ["RENDER_PROFILE"] = args.profile
+
+    results = render_jobs(args.scripts, processes=args.processes)
+    sys.exit(1 if any(error for _, _, error in results) else 0)
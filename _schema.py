@@ -0,0 +1,198 @@
+"""
+Compact dtypes for the stored FBref tables.
+
+Each stored table (schedule, players, lineups, cube) has a schema: the
+columns it must have and the dtype each is kept in. Repeated labels
+(leagues, seasons, teams, rounds, venues) become categoricals, free text
+becomes pyarrow strings, xG float32 and counts the smallest integer that
+holds them. Columns a schema does not name, such as the hundreds of player
+stat columns, are downcast by their values, and floats only where float32
+holds every value exactly.
+
+`apply_schema` runs when a table is stored and again on load (it is
+idempotent), so frames come back in the same dtypes whatever the file
+format or partitioning did to them, e.g. ``season=2425`` read back as an
+integer. `expand_dtypes` maps a frame back to the plain numpy and object
+dtypes the scripts were written against, for code that needs them.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+
+    STRING = "string[pyarrow]"
+except ImportError:
+    STRING = "string"
+
+CATEGORY = "category"
+
+SCHEMAS = {
+    "schedule": {
+        "league": CATEGORY,
+        "season": CATEGORY,
+        "game": STRING,
+        "round": CATEGORY,
+        "week": "Int8",
+        "day": CATEGORY,
+        "date": "datetime64[ns]",
+        "time": CATEGORY,
+        "home_team": CATEGORY,
+        "home_xg": "float32",
+        "score": CATEGORY,
+        "away_xg": "float32",
+        "away_team": CATEGORY,
+        "attendance": "UInt32",
+        "venue": CATEGORY,
+        "referee": CATEGORY,
+        "match_report": STRING,
+        "notes": STRING,
+        "game_id": STRING,
+    },
+    "players": {
+        "league": CATEGORY,
+        "season": CATEGORY,
+        "team": CATEGORY,
+        "player": STRING,
+        "nation": CATEGORY,
+        "pos": CATEGORY,
+    },
+    "lineups": {
+        "league": CATEGORY,
+        "season": CATEGORY,
+        "game": STRING,
+        "team": CATEGORY,
+        "player": STRING,
+        "jersey_number": "Int8",
+        "position": CATEGORY,
+        "is_starter": "boolean",
+        "minutes_played": "Int16",
+    },
+    "cube": {
+        "league": CATEGORY,
+        "season": CATEGORY,
+        "team": CATEGORY,
+        "side": CATEGORY,
+        "matches": "Int16",
+        "wins": "Int16",
+        "draws": "Int16",
+        "losses": "Int16",
+        "points": "Int16",
+        "goals_for": "Int16",
+        "goals_against": "Int16",
+        "clean_sheets": "Int16",
+        "big_clean_wins": "Int16",
+        "xg_matches": "Int16",
+        "xg_for": "float32",
+        "xg_against": "float32",
+        "attendance_matches": "Int16",
+        "attendance": "UInt32",
+    },
+}
+# Columns a stored table cannot do without; the others may be missing, e.g.
+# `week` in leagues FBref lists by round only.
+REQUIRED = {
+    "schedule": ["league", "season", "game", "home_team", "away_team", "score"],
+    "players": ["league", "season", "team", "player"],
+    "lineups": ["league", "season", "game", "team", "player"],
+    "cube": ["league", "season", "team", "side", "matches"],
+}
+# Object columns with at most this share of distinct values become
+# categoricals, the others strings.
+CATEGORY_SHARE = 0.5
+
+
+def _downcast(series):
+    """
+    Smallest dtype for a column no schema names.
+    """
+    if pd.api.types.is_bool_dtype(series) or isinstance(
+        series.dtype, pd.CategoricalDtype
+    ):
+        return series
+    if series.dropna().empty:
+        # Nothing to size the dtype by, e.g. a stat no player has yet.
+        return series
+    if pd.api.types.is_float_dtype(series):
+        # Only lossless: 12.3 is not a float32, and the noise would leak
+        # into rates and percentiles.
+        narrow = series.astype("float32")
+        if np.array_equal(
+            narrow.to_numpy(float), series.to_numpy(float), equal_nan=True
+        ):
+            return narrow
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        nullable = pd.api.types.is_extension_array_dtype(series)
+        for dtype in ("int8", "int16", "int32"):
+            info = np.iinfo(dtype)
+            if series.min() >= info.min and series.max() <= info.max:
+                return series.astype(dtype.capitalize() if nullable else dtype)
+        return series
+    if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+        if series.nunique() <= CATEGORY_SHARE * len(series):
+            return series.astype(str).where(series.notna()).astype(CATEGORY)
+        return series.astype(STRING)
+    return series
+
+
+def _cast(series, dtype):
+    if series.dtype == dtype:
+        return series
+    if dtype == CATEGORY:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series
+        # Labels are kept as text: seasons are "2425", not 2425.
+        return series.astype(str).where(series.notna()).astype(CATEGORY)
+    if dtype == STRING:
+        return series.astype(str).where(series.notna()).astype(STRING)
+    if dtype.startswith(("Int", "UInt")):
+        return pd.to_numeric(series, errors="coerce").round().astype(dtype)
+    return series.astype(dtype)
+
+
+def apply_schema(df, table, validate=True):
+    """
+    `df` in the compact dtypes of `table`: schema columns are cast, others
+    downcast. Raises ValueError when a required column is missing, unless
+    `validate` is off for frames read with a subset of the columns.
+    """
+    schema = SCHEMAS[table]
+    missing = [c for c in REQUIRED[table] if c not in df.columns]
+    if validate and missing:
+        raise ValueError(f"{table} table is missing columns {missing}")
+
+    compact = {}
+    for column in df.columns:
+        if column in schema:
+            compact[column] = _cast(df[column], schema[column])
+        else:
+            compact[column] = _downcast(df[column])
+    return pd.DataFrame(compact, index=df.index)
+
+
+def expand_dtypes(df):
+    """
+    `df` with categoricals and strings as object, floats as float64 and
+    integers as int64 (float64 where values are missing).
+    """
+    expanded = {}
+    for column in df.columns:
+        series = df[column]
+        if isinstance(
+            series.dtype, pd.CategoricalDtype
+        ) or pd.api.types.is_string_dtype(series):
+            series = series.astype(object).where(series.notna(), None)
+        elif pd.api.types.is_bool_dtype(series):
+            series = series.astype(bool if not series.hasnans else object)
+        elif pd.api.types.is_float_dtype(series):
+            series = series.astype("float64")
+        elif pd.api.types.is_integer_dtype(series):
+            series = series.astype("float64" if series.hasnans else "int64")
+        expanded[column] = series
+    return pd.DataFrame(expanded, index=df.index)
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
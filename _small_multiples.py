@@ -0,0 +1,119 @@
+import io
+import numpy as np
+import matplotlib.pyplot as plt
+
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.colors import LinearSegmentedColormap, Normalize
+from _commons import get_render_profile
+from _table_commons import add_text_batch
+
+PANEL_COLORS = ["#c3d011", "#226f54"]
+FACECOLOR = "#eceff4"
+
+
+def _draw_panel(ax, title, labels, values, cmap, norm, xmax):
+    """
+    One horizontal bar panel: bars coloured on the shared scale, labels
+    written inside the bars in a single batched call.
+    """
+    positions = np.arange(len(values))
+    ax.barh(
+        positions,
+        values,
+        color=cmap(norm(values)),
+        edgecolor="grey",
+        alpha=0.8,
+    )
+    ax.set_yticks([])
+    add_text_batch(
+        ax,
+        np.full(len(labels), 0.2),  # A bit of padding from left edge
+        positions,
+        list(labels),
+        fontsize=11,
+        fontweight="bold",
+        color="white",
+        ha="left",
+        stroke=(1.75, "black") if get_render_profile()["path_effects"] else None,
+    )
+    ax.axvline(0, color="black", lw=1)
+    ax.set_title(title, fontsize=13, fontweight="bold", pad=8)
+    ax.grid(axis="x", linestyle="--", alpha=0.6)
+    ax.set_facecolor(FACECOLOR)
+    ax.set_xlim(0, xmax * 1.05)
+    ax.invert_yaxis()
+
+
+def _rasterise_panel(args):
+    title, labels, values, vmin, vmax, panelSize, dpi = args
+    plt.rcParams["font.family"] = "Monospace"
+    cmap = LinearSegmentedColormap.from_list("green_gradient", PANEL_COLORS)
+    fig, ax = plt.subplots(figsize=panelSize, dpi=dpi)
+    fig.patch.set_facecolor(FACECOLOR)
+    _draw_panel(ax, title, labels, values, cmap, Normalize(vmin, vmax), vmax)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", facecolor=FACECOLOR, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def draw_small_multiples(
+    df,
+    panel,
+    label,
+    value,
+    ncols=2,
+    vmin=1,
+    vmax=None,
+    figsize=(12, 16),
+    dpi=600,
+    parallel=False,
+    processes=None,
+):
+    """
+    Lay out one bar panel per value of `panel` from a long frame with
+    `panel`, `label` and `value` columns, in the order panels first appear.
+
+    The colour scale and x range are computed once and shared by every
+    panel. With `parallel`, panels are rasterised in a process pool and the
+    grid is assembled from the resulting images.
+    """
+    vmax = vmax if vmax is not None else df[value].max()
+    groups = list(df.groupby(panel, sort=False))
+    nrows = max(1, -(-len(groups) // ncols))
+
+    fig, axs = plt.subplots(
+        nrows, ncols, figsize=figsize, sharex=not parallel, dpi=dpi, squeeze=False
+    )
+    fig.subplots_adjust(wspace=0.1, hspace=0.3)
+    fig.patch.set_facecolor(FACECOLOR)
+    for ax in axs.flat[len(groups) :]:
+        fig.delaxes(ax)
+
+    if parallel:
+        panelSize = (figsize[0] / ncols, figsize[1] / nrows)
+        jobs = [
+            (
+                str(name),
+                g[label].tolist(),
+                g[value].to_numpy(),
+                vmin,
+                vmax,
+                panelSize,
+                dpi,
+            )
+            for name, g in groups
+        ]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            images = list(pool.map(_rasterise_panel, jobs))
+        for ax, png in zip(axs.flat, images):
+            ax.imshow(plt.imread(io.BytesIO(png)))
+            ax.set_axis_off()
+        return fig
+
+    cmap = LinearSegmentedColormap.from_list("green_gradient", PANEL_COLORS)
+    norm = Normalize(vmin=vmin, vmax=vmax)
+    for ax, (name, g) in zip(axs.flat, groups):
+        ax.tick_params(axis="x", labelbottom=True)
+        _draw_panel(ax, str(name), g[label], g[value].to_numpy(), cmap, norm, vmax)
+    return fig
@@ -0,0 +1,50 @@
+"""
+Sorare fixture helpers: which upcoming matches are easy for a team's
+defenders or attackers, and which pairs of teams have easy matches in the
+same gameweeks.
+"""
+
+from _fbref_commons import normalize_fbref_schedule
+
+_TEAM_COLS = {
+    "home": {"home_team": "team", "away_team": "opponent"},
+    "away": {"home_team": "opponent", "away_team": "team"},
+}
+
+
+def easy_fixtures(fixtures, mode, offStrong, offWeak, defStrong, defWeak):
+    """
+    Boolean mask of the team-level `fixtures` that are easy in `mode`: a
+    strong defence against a weak attack ("DEF"), or a strong attack against
+    a weak defence ("OFF").
+    """
+    if mode == "DEF":
+        return fixtures["team"].isin(defStrong) & fixtures["opponent"].isin(offWeak)
+    return fixtures["team"].isin(offStrong) & fixtures["opponent"].isin(defWeak)
+
+
+def fixture_pairings(
+    schedule, offStrong, offWeak, defStrong, defWeak, target_mode="DEF"
+):
+    """
+    For every pair of teams, the number of gameweeks in which the first has
+    an easy `target_mode` match and the second an easy match of the opposite
+    mode. `schedule` holds the upcoming matches, one row per match.
+
+    Returns ``team_tgt``, ``team_opp`` and ``Count`` columns.
+    """
+    fixtures = normalize_fbref_schedule(
+        schedule[["week", "home_team", "away_team"]],
+        _TEAM_COLS["home"],
+        _TEAM_COLS["away"],
+    )
+    opposite_mode = "OFF" if target_mode == "DEF" else "DEF"
+    strength = (offStrong, offWeak, defStrong, defWeak)
+    target = fixtures.loc[easy_fixtures(fixtures, target_mode, *strength)]
+    opposite = fixtures.loc[easy_fixtures(fixtures, opposite_mode, *strength)]
+
+    merged = target[["week", "team"]].merge(
+        opposite[["week", "team"]], on="week", suffixes=("_tgt", "_opp")
+    )
+    merged = merged[merged["team_tgt"] != merged["team_opp"]]
+    return merged.groupby(["team_tgt", "team_opp"]).size().reset_index(name="Count")
@@ -0,0 +1,159 @@
+"""
+Fetch, transform and render stages shared by the pipeline visuals, and the
+specs of the visuals built from them (see `_pipeline`).
+"""
+
+import pandas as pd
+
+from _fbref_commons import (
+    calc_trend_from_values,
+    fbref_client,
+    flattenMultiCol,
+    normalize_fbref_schedule,
+    separate_score,
+)
+from _pipeline import Render, Stage
+from _store import write_table
+from _teams import decode_teams, encode_teams, league_fotmob_ids, league_team_ids
+
+PAST_SEASONS = [1718, 1819, 1920, 2021, 2122, 2223, 2324, 2425]
+HOME_COLS = {
+    "home_team": "team",
+    "away_team": "opponent",
+    "home_xg": "xg",
+    "away_xg": "opponent_xg",
+    "home_goals": "goals",
+    "away_goals": "opponent_goals",
+}
+AWAY_COLS = {
+    "home_team": "opponent",
+    "away_team": "team",
+    "home_xg": "opponent_xg",
+    "away_xg": "xg",
+    "home_goals": "opponent_goals",
+    "away_goals": "goals",
+}
+SEASON_HEADERS = {
+    "1718": "17/18",
+    "1819": "18/19",
+    "1920": "19/20",
+    "2021": "20/21",
+    "2122": "21/22",
+    "2223": "22/23",
+    "2324": "23/24",
+    "2425": "24/25",
+}
+
+
+# Fetch
+
+
+def fetch_schedule(league, seasons):
+    df = fbref_client(league, seasons).read_schedule().reset_index()
+    df.columns = flattenMultiCol(df.columns)
+    # Every fetch also refreshes the store and its cube (see `_store`).
+    write_table(df, "schedule")
+    return df
+
+
+# Transform
+
+
+def team_match_rows(schedule, round_name):
+    """
+    One row per team and played match of `round_name`, teams as registry ids.
+    """
+    df = schedule[schedule["round"] == round_name].copy()
+    df["home_goals"], df["away_goals"] = separate_score(df["score"])
+    df = normalize_fbref_schedule(df, HOME_COLS, AWAY_COLS)
+    df = encode_teams(df, ["team", "opponent"])
+    return df[
+        [
+            "round",
+            "team",
+            "season",
+            "opponent",
+            "goals",
+            "opponent_goals",
+            "game_id",
+            "at_home",
+        ]
+    ]
+
+
+def smashers_table(rows, league, trend_seasons=5):
+    """
+    Per team and season, matches won scoring 2+ and conceding none, with the
+    total, its share of all matches played and its recent trend.
+    """
+    games_per_season = rows.groupby(["team"])["game_id"].count()
+    rows = rows[(rows["goals"] >= 2) & (rows["opponent_goals"] == 0)]
+
+    res = rows.groupby(["team", "season"])["game_id"].count().unstack()
+    res = res[res.index.isin(league_team_ids(league))]
+    res["total"] = res.sum(axis=1)
+    res["cs_perc"] = (res["total"] / games_per_season.reindex(res.index) * 100).round(2)
+
+    season_cols = [c for c in res.columns if str(c).isdigit()]
+    res["trend"] = res.apply(
+        lambda row: calc_trend_from_values(
+            row[season_cols[-trend_seasons:]].astype(float).values
+        ),
+        axis=1,
+    )
+    res = res.sort_values(by="cs_perc", ascending=False)
+    res.index = pd.Index(decode_teams(res.index), name="team")
+    return res
+
+
+# Render
+
+
+def draw_smashers_table(res, league, no_trend=()):
+    import matplotlib.pyplot as plt
+    from _commons import render_dpi
+    from _table_commons import draw_heat_table
+
+    plt.rcParams["font.family"] = "Monospace"
+    fig, ax = plt.subplots(figsize=(12, 8), dpi=render_dpi(300))
+    ax.set_facecolor("#eeeeee")
+    ax.set_axis_off()
+    ax.set_xlim(0, 1)
+
+    draw_heat_table(
+        ax,
+        res,
+        {**SEASON_HEADERS, "total": "Total", "cs_perc": "%", "trend": "Last 5"},
+        team_to_fotmob_id=league_fotmob_ids(league),
+        no_trend=no_trend,
+    )
+    for x, ha, text in [
+        (0, "left", "Mask: 2+ scored, 0 conceded"),
+        (1, "right", "@francescozonaro"),
+    ]:
+        ax.text(
+            x=x,
+            y=0,
+            s=text,
+            transform=ax.transAxes,
+            ha=ha,
+            va="bottom",
+            fontsize=9,
+            alpha=0.85,
+        )
+    return fig
+
+
+# Visuals
+
+
+def smashers_visual(league, round_name, output, seasons=PAST_SEASONS, no_trend=()):
+    """
+    Heat table of the teams that most often win 2+ to nil, over `seasons`.
+    """
+    schedule = Stage(fetch_schedule, league=league, seasons=seasons)
+    rows = Stage(team_match_rows, schedule, round_name=round_name)
+    table = Stage(smashers_table, rows, league=league)
+    return Render(
+        draw_smashers_table, table, output=output, league=league, no_trend=no_trend
+    )
@@ -0,0 +1,197 @@
+"""
+Partitioned Parquet store of the FBref tables, in the compact dtypes of
+`_schema`.
+
+Usage:
+    python _store.py info
+    python _store.py import fbrefData
+
+Each table is kept under `STORE_FOLDER` as one file per league-season,
+``<table>/league=<league>/season=<season>/part.parquet``, so readers only
+open the partitions they ask for. Schedules are stored as they are fetched.
+`import` copies in the per-league-season player and lineup files the readers
+of `_fbref_commons` wrote, and the schedules scripts and pipeline stages
+cached as pickles before.
+"""
+
+import argparse
+import glob
+import os
+import re
+import pandas as pd
+
+from _fbref_commons import FBREF_FOLDER, flattenMultiCol
+from _schema import CATEGORY, REQUIRED, SCHEMAS, apply_schema, memory_mb
+
+STORE_FOLDER = f"{FBREF_FOLDER}/store"
+PARTITION_KEYS = ["league", "season"]
+
+
+def partition_path(table, league, season, folder=STORE_FOLDER):
+    return f"{folder}/{table}/league={league}/season={season}/part.parquet"
+
+
+def partition_paths(table, leagues=None, seasons=None, folder=STORE_FOLDER):
+    """
+    ``{(league, season): path}`` of the stored partitions of `table`,
+    only of `leagues` and `seasons` when given.
+    """
+    pattern = re.compile(r"league=(.+)/season=(.+)/part\.parquet$")
+    paths = {}
+    for path in sorted(glob.glob(f"{folder}/{table}/league=*/season=*/part.parquet")):
+        league, season = pattern.search(path.replace(os.sep, "/")).groups()
+        if leagues is not None and league not in leagues:
+            continue
+        if seasons is not None and season not in map(str, seasons):
+            continue
+        paths[league, season] = path
+    return paths
+
+
+def write_table(df, table, folder=STORE_FOLDER):
+    """
+    Store `df` in its league-season partitions, replacing those partitions.
+    Storing schedules adds their new matches to the aggregate cube (see
+    `_cube`). Returns the paths written.
+    """
+    df = apply_schema(df, table)
+    paths = []
+    for (league, season), part in df.groupby(PARTITION_KEYS, observed=True):
+        path = partition_path(table, league, season, folder)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Readers never see half a partition: write aside, then swap in.
+        part.drop(columns=PARTITION_KEYS).to_parquet(f"{path}.tmp", index=False)
+        os.replace(f"{path}.tmp", path)
+        paths.append(path)
+    if table == "schedule":
+        from _cube import update_cube
+
+        update_cube(df, folder)
+    return paths
+
+
+def _concat(frames):
+    """
+    Concatenate partitions, each already in its table's schema dtypes,
+    without losing categoricals: a column categorical in any partition gets
+    the union of their categories in all of them, also where a partition
+    downcast it to strings instead.
+    """
+    columns = dict.fromkeys(c for f in frames for c in f.columns)
+    for column in columns:
+        parts = [f[column] for f in frames if column in f]
+        if not any(isinstance(p.dtype, pd.CategoricalDtype) for p in parts):
+            continue
+        categories = pd.Index([])
+        for p in parts:
+            values = p.cat.categories if p.dtype == CATEGORY else p.dropna()
+            categories = categories.union(pd.Index(values.astype(str)).unique())
+        dtype = pd.CategoricalDtype(categories)
+        for f in frames:
+            if column in f:
+                f[column] = f[column].astype(str).where(f[column].notna()).astype(dtype)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _stored_columns(path):
+    import pyarrow.parquet as pq
+
+    return pq.read_schema(path).names
+
+
+def read_table(table, leagues=None, seasons=None, columns=None, folder=STORE_FOLDER):
+    """
+    Rows of `table` for `leagues` and `seasons` (all when None), with the
+    league and season keys and `columns` only when given. Partitions without
+    some of `columns`, e.g. xG in leagues FBref has none for, leave them
+    missing.
+    """
+    paths = partition_paths(table, leagues, seasons, folder)
+    if columns is not None:
+        columns = [c for c in columns if c not in PARTITION_KEYS]
+    frames = []
+    for (league, season), path in paths.items():
+        if columns is None:
+            part = pd.read_parquet(path)
+        else:
+            stored = set(_stored_columns(path))
+            part = pd.read_parquet(path, columns=[c for c in columns if c in stored])
+        part.insert(0, "season", season)
+        part.insert(0, "league", league)
+        frames.append(apply_schema(part, table, validate=columns is None))
+    if not frames:
+        return pd.DataFrame(columns=PARTITION_KEYS + (columns or []))
+    return _concat(frames)
+
+
+def _cached_schedule(path):
+    """
+    The schedule a script or pipeline stage pickled at `path`, None when the
+    pickle holds anything else.
+    """
+    try:
+        df = pd.read_pickle(path)
+    except Exception:
+        return None
+    if not isinstance(df, pd.DataFrame):
+        return None
+    if "league" in df.index.names:
+        df = df.reset_index()
+    df.columns = flattenMultiCol(df.columns)
+    return df if set(REQUIRED["schedule"]) <= set(df.columns) else None
+
+
+def import_tables(source=FBREF_FOLDER, folder=STORE_FOLDER):
+    """
+    Copy the player and lineup tables stored by `_fbref_commons`, and the
+    schedules pickled anywhere under `source`, into the store. Schedules are
+    copied oldest first, so the latest fetch of a league-season wins.
+    Returns the number of partitions written.
+    """
+    written = 0
+    for table in ("players", "lineups"):
+        for path in sorted(glob.glob(f"{source}/*_{table}.parquet")):
+            written += len(write_table(pd.read_parquet(path), table, folder))
+    pickles = glob.glob(f"{source}/**/*.pkl", recursive=True)
+    for path in sorted(pickles, key=os.path.getmtime):
+        schedule = _cached_schedule(path)
+        if schedule is not None:
+            written += len(write_table(schedule, "schedule", folder))
+    return written
+
+
+def store_info(folder=STORE_FOLDER):
+    """
+    Partitions, rows, size on disk and in memory of every stored table.
+    """
+    rows = []
+    for table in SCHEMAS:
+        paths = partition_paths(table, folder=folder)
+        if not paths:
+            continue
+        df = read_table(table, folder=folder)
+        rows.append(
+            {
+                "table": table,
+                "partitions": len(paths),
+                "rows": len(df),
+                "disk_mb": sum(map(os.path.getsize, paths.values())) / 1e6,
+                "memory_mb": memory_mb(df),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--store", default=STORE_FOLDER)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("info", help="stored tables and their size")
+    importParser = commands.add_parser("import", help="copy stored tables in")
+    importParser.add_argument("source", nargs="?", default=FBREF_FOLDER)
+    args = parser.parse_args()
+
+    if args.command == "import":
+        print(f"{import_tables(args.source, args.store)} partitions written")
+    else:
+        print(store_info(args.store).round(2).to_string(index=False))
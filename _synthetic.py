@@ -0,0 +1,204 @@
+"""
+Synthetic FBref-shaped frames for benchmarks: schedules, lineups and wide
+player tables with the column names the readers produce after
+`flattenMultiCol`, for any number of league-seasons.
+
+Everything is drawn from a seeded generator, so the same arguments always
+give the same frames.
+"""
+
+import numpy as np
+import pandas as pd
+
+BENCHMARK_LEAGUE = "BEL-Belgian Pro League"
+SCHEDULE_COLUMNS = [
+    "league",
+    "season",
+    "game",
+    "round",
+    "week",
+    "day",
+    "date",
+    "time",
+    "home_team",
+    "home_xg",
+    "score",
+    "away_xg",
+    "away_team",
+    "attendance",
+    "venue",
+    "referee",
+    "match_report",
+    "notes",
+    "game_id",
+]
+POSITIONS = ["GK", "DF", "DF", "DF", "DF", "MF", "MF", "MF", "FW", "FW", "FW"]
+
+
+def league_seasons(n):
+    """
+    `n` (league, season) pairs: the benchmark league first, then made-up
+    leagues, five seasons each.
+    """
+    leagues = [BENCHMARK_LEAGUE] + [f"SYN-League {i:02d}" for i in range(1, n // 5 + 1)]
+    seasons = ["2122", "2223", "2324", "2425", "2526"]
+    return [(league, season) for league in leagues for season in seasons][:n]
+
+
+def league_teams(league, n_teams=16):
+    code = league.split("-")[0]
+    return [f"{code} Team {i:02d}" for i in range(n_teams)]
+
+
+def _round_robin(teams):
+    """
+    Double round robin by the circle method: (week, home, away) triples.
+    """
+    teams = list(teams)
+    n = len(teams)
+    fixtures = []
+    for week in range(n - 1):
+        for i in range(n // 2):
+            home, away = teams[i], teams[n - 1 - i]
+            if week % 2:
+                home, away = away, home
+            fixtures.append((week + 1, home, away))
+            fixtures.append((week + n, away, home))
+        teams.insert(1, teams.pop())
+    return sorted(fixtures)
+
+
+def synthetic_schedule(n_league_seasons=1, n_teams=16, played_share=1.0, seed=0):
+    """
+    Schedule of `n_league_seasons` league-seasons, shaped like
+    ``read_schedule().reset_index()``. The first `played_share` of each
+    season's weeks have a score and xG; later matches are upcoming.
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    for league, season in league_seasons(n_league_seasons):
+        fixtures = pd.DataFrame(
+            _round_robin(league_teams(league, n_teams)),
+            columns=["week", "home_team", "away_team"],
+        )
+        n = len(fixtures)
+        start = pd.Timestamp(f"20{season[:2]}-08-01")
+        dates = start + pd.to_timedelta((fixtures["week"] - 1) * 7, unit="D")
+        played = fixtures["week"] <= played_share * fixtures["week"].max()
+
+        home_xg = rng.gamma(3.0, 0.5, n).round(1)
+        away_xg = rng.gamma(3.0, 0.4, n).round(1)
+        home_goals, away_goals = rng.poisson(home_xg), rng.poisson(away_xg)
+        score = pd.Series(
+            [f"{h}–{a}" for h, a in zip(home_goals, away_goals)], dtype=object
+        )
+
+        frame = fixtures.assign(
+            league=league,
+            season=season,
+            game=dates.dt.strftime("%Y-%m-%d ")
+            + fixtures["home_team"]
+            + "-"
+            + fixtures["away_team"],
+            round="Regular season",
+            day=dates.dt.strftime("%a"),
+            date=dates,
+            time="20:00",
+            home_xg=np.where(played, home_xg, np.nan),
+            score=score.where(played),
+            away_xg=np.where(played, away_xg, np.nan),
+            attendance=np.where(played, rng.integers(2000, 40000, n), np.nan),
+            venue=fixtures["home_team"] + " Stadium",
+            referee=[f"Referee {i:02d}" for i in rng.integers(0, 20, n)],
+            match_report="Match Report",
+            notes=None,
+        )
+        frames.append(frame)
+
+    schedule = pd.concat(frames, ignore_index=True)
+    schedule["game_id"] = [f"{i:08x}" for i in range(len(schedule))]
+    return schedule[SCHEDULE_COLUMNS]
+
+
+def synthetic_lineups(schedule, squad_size=18, seed=0):
+    """
+    Lineups of the played matches of `schedule`, shaped like
+    ``read_lineup().reset_index()``: 11 starters and the bench per side.
+    """
+    rng = np.random.default_rng(seed)
+    played = schedule[schedule["score"].notna()]
+    sides = pd.concat(
+        [
+            played[["league", "season", "game", "home_team"]].rename(
+                columns={"home_team": "team"}
+            ),
+            played[["league", "season", "game", "away_team"]].rename(
+                columns={"away_team": "team"}
+            ),
+        ],
+        ignore_index=True,
+    )
+    lineups = sides.loc[sides.index.repeat(squad_size)].reset_index(drop=True)
+    slot = np.tile(np.arange(squad_size), len(sides))
+    starter = slot < 11
+    lineups["player"] = lineups["team"] + " Player " + pd.Series(slot).astype(str)
+    lineups["jersey_number"] = slot + 1
+    lineups["position"] = np.where(
+        starter, np.array(POSITIONS)[np.minimum(slot, 10)], "SUB"
+    )
+    lineups["is_starter"] = starter
+    lineups["minutes_played"] = np.where(
+        starter, rng.integers(60, 91, len(lineups)), rng.integers(0, 31, len(lineups))
+    )
+    return lineups
+
+
+def synthetic_player_stats(n_league_seasons=1, n_teams=16, squad_size=25, seed=0):
+    """
+    Wide player-season table, shaped like the `build_player_table` output:
+    one row per player with standard, shooting, passing and defense columns.
+    """
+    rng = np.random.default_rng(seed)
+    keys = [
+        (league, season, team, f"{team} Player {i}")
+        for league, season in league_seasons(n_league_seasons)
+        for team in league_teams(league, n_teams)
+        for i in range(squad_size)
+    ]
+    df = pd.DataFrame(keys, columns=["league", "season", "team", "player"])
+    n = len(df)
+    nineties = rng.uniform(0, 34, n).round(1)
+    df["nation"] = rng.choice(["ENG", "BEL", "FRA", "ESP", "GER", "NED"], n)
+    df["pos"] = rng.choice(["GK", "DF", "MF", "FW", "DF,MF", "MF,FW"], n)
+    df["age"] = rng.integers(17, 37, n)
+    df["born"] = 2025 - df["age"]
+    df["90s"] = nineties
+    df["standard_gls"] = rng.poisson(nineties * 0.15)
+    df["expected_xg"] = (nineties * rng.gamma(1.0, 0.15, n)).round(1)
+    df["ast"] = rng.poisson(nineties * 0.1)
+    df["expected_xa"] = (nineties * rng.gamma(1.0, 0.1, n)).round(1)
+    df["standard_sh"] = rng.poisson(nineties * 1.2)
+    df["standard_sot%"] = rng.uniform(10, 60, n).round(1)
+    df["total_cmp%"] = rng.uniform(55, 95, n).round(1)
+    df["tackles_tkl"] = rng.poisson(nineties * 1.5)
+    df["tackles_tklw"] = rng.binomial(df["tackles_tkl"], 0.6)
+    df["challenges_tkl%"] = rng.uniform(20, 80, n).round(1)
+    df["int"] = rng.poisson(nineties * 0.9)
+    return df
+
+
+def synthetic_team_table(n_teams=20, seed=0):
+    """
+    Team-by-season table in the shape `draw_heat_table` renders.
+    """
+    rng = np.random.default_rng(seed)
+    seasons = ["1718", "1819", "1920", "2021", "2122", "2223", "2324", "2425"]
+    res = pd.DataFrame(
+        rng.integers(0, 12, (n_teams, len(seasons))).astype(float),
+        index=pd.Index([f"Team {i:02d}" for i in range(n_teams)], name="team"),
+        columns=seasons,
+    )
+    res["total"] = res.sum(axis=1)
+    res["cs_perc"] = (res["total"] / (34 * len(seasons)) * 100).round(2)
+    res["trend"] = rng.normal(0, 0.2, n_teams)
+    return res.sort_values("cs_perc", ascending=False)
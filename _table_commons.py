@@ -0,0 +1,251 @@
+import numpy as np
+
+from functools import lru_cache
+from matplotlib import rcParams
+from matplotlib.collections import PathCollection, PolyCollection
+from matplotlib.colors import LinearSegmentedColormap, Normalize, to_rgba_array
+from matplotlib.font_manager import FontProperties
+from matplotlib.offsetbox import AnnotationBbox, OffsetImage
+from matplotlib.patches import FancyArrow
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D, IdentityTransform
+from _commons import PROBE_DPI, fetch_logo, text_probe
+from _teams import FOTMOB_TEAM_LOGO_URL
+
+
+@lru_cache(maxsize=None)
+def _glyph_path(text, size, weight, family, ha, va):
+    """
+    Return the glyph outline of `text` in points, shifted so that (0, 0) is the
+    anchor point an ``ax.text(..., ha=ha, va=va)`` call would use.
+    """
+    prop = FontProperties(family=family, size=size, weight=weight)
+    fig, renderer = text_probe()
+
+    # Let matplotlib's own text layout decide the alignment, then measure it.
+    aligned = fig.text(0, 0, text, fontproperties=prop, ha=ha, va=va)
+    baseline = fig.text(0, 0, text, fontproperties=prop, ha=ha, va="baseline")
+    aligned.set_transform(IdentityTransform())
+    baseline.set_transform(IdentityTransform())
+    box = aligned.get_window_extent(renderer)
+    dy = box.y0 - baseline.get_window_extent(renderer).y0
+    aligned.remove()
+    baseline.remove()
+
+    toPoints = 72 / PROBE_DPI
+    path = TextPath((0, 0), text, prop=prop)
+    return path.transformed(Affine2D().translate(box.x0 * toPoints, dy * toPoints))
+
+
+def add_text_batch(
+    ax,
+    xs,
+    ys,
+    texts,
+    fontsize=9,
+    fontweight="normal",
+    color="black",
+    ha="center",
+    va="center",
+    family=None,
+    transform=None,
+    zorder=3,
+    stroke=None,
+):
+    """
+    Draw many short labels as a single PathCollection instead of one Text
+    artist per label.
+
+    Glyph outlines are cached per string, so tables with repeated values only
+    lay out each distinct value once. `stroke` is an optional
+    ``(linewidth, color)`` pair that mimics ``path_effects.withStroke``.
+    Empty strings are skipped.
+    """
+    family = family or tuple(rcParams["font.family"])
+    keep = [i for i, t in enumerate(texts) if t]
+    paths = [_glyph_path(texts[i], fontsize, fontweight, family, ha, va) for i in keep]
+    offsets = np.column_stack([np.asarray(xs)[keep], np.asarray(ys)[keep]])
+    pointsToPixels = Affine2D().scale(1 / 72) + ax.figure.dpi_scale_trans
+
+    layers = []
+    if stroke is not None:
+        strokeWidth, strokeColor = stroke
+        layers.append(
+            dict(facecolors=strokeColor, edgecolors=strokeColor, linewidths=strokeWidth)
+        )
+    layers.append(dict(facecolors=color, edgecolors="none", linewidths=0))
+
+    collections = []
+    for layer in layers:
+        coll = PathCollection(
+            paths,
+            offsets=offsets,
+            offset_transform=transform or ax.transData,
+            zorder=zorder,
+            joinstyle="round",
+            **layer,
+        )
+        coll.set_transform(pointsToPixels)
+        coll.set_clip_on(False)
+        ax.add_collection(coll, autolim=False)
+        collections.append(coll)
+    return collections
+
+
+def add_rect_batch(ax, x0, x1, y0, y1, colors, zorder=-1):
+    """
+    Draw axis-aligned rectangles as one PolyCollection. Each argument is
+    broadcast, so a single x-range can be shared by every rectangle.
+    """
+    x0, x1, y0, y1 = np.broadcast_arrays(*map(np.asarray, (x0, x1, y0, y1)))
+    verts = np.stack(
+        [
+            np.column_stack([x0, y0]),
+            np.column_stack([x1, y0]),
+            np.column_stack([x1, y1]),
+            np.column_stack([x0, y1]),
+        ],
+        axis=1,
+    )
+    # Like fill_between(color=...), the edge is stroked in the face colour.
+    colors = to_rgba_array(colors)
+    coll = PolyCollection(verts, facecolors=colors, edgecolors=colors, zorder=zorder)
+    ax.add_collection(coll)
+    return coll
+
+
+def add_arrow_batch(ax, x0, y0, dx, dy, colors, head=0.005, linewidth=1, zorder=1):
+    """
+    Draw arrows with the same outline ``ax.arrow(..., length_includes_head=True)``
+    would produce, but as a single PolyCollection.
+    """
+    verts = [
+        FancyArrow(
+            x, y, u, v, head_width=head, head_length=head, length_includes_head=True
+        ).get_xy()
+        for x, y, u, v in zip(x0, y0, dx, dy)
+    ]
+    coll = PolyCollection(
+        verts,
+        facecolors=colors,
+        edgecolors=colors,
+        linewidths=linewidth,
+        joinstyle="miter",
+        zorder=zorder,
+    )
+    ax.add_collection(coll)
+    return coll
+
+
+def draw_heat_table(
+    ax,
+    res,
+    header_mappings,
+    team_to_fotmob_id=None,
+    heat_col="cs_perc",
+    trend_col="trend",
+    no_trend=(),
+    top=0.9,
+    row_height=0.04,
+    left_marg=0.3,
+    right_marg=1,
+    fontsize=9,
+):
+    """
+    Render a team table (one row per team, one column per stat) on `ax`.
+
+    `heat_col` gets a red-to-green background and is printed as a percentage,
+    `trend_col` is drawn as an arrow whose slope follows the value. Teams in
+    `no_trend` get an empty trend cell. Row bands, heat cells, arrows and cell
+    values are each emitted as a single collection.
+    """
+    nRows, nCols = res.shape
+    colSpace = (right_marg - left_marg) / (nCols - 1)
+    colPositions = left_marg + np.arange(nCols) * colSpace - colSpace / 2
+    ys = top - np.arange(nRows) * row_height
+    half = row_height / 2
+
+    rowColors = np.array(["#eaeaea", "#d5d5d5"])[np.arange(nRows) % 2]
+    add_rect_batch(ax, 0, 1, ys - half, ys + half, rowColors)
+
+    values = res.to_numpy(dtype=float, na_value=np.nan)
+    cells = np.where(
+        np.isnan(values), "-", np.nan_to_num(values).astype(int).astype(str)
+    )
+
+    if heat_col in res.columns:
+        j = res.columns.get_loc(heat_col)
+        heat = values[:, j]
+        valid = ~np.isnan(heat)
+        cmap = LinearSegmentedColormap.from_list(
+            "custom_red_green", ["#e76f51", "#588157"]
+        )
+        norm = Normalize(vmin=np.nanmin(heat), vmax=np.nanmax(heat))
+        add_rect_batch(
+            ax,
+            colPositions[j] - colSpace / 2,
+            colPositions[j] + colSpace / 2,
+            ys[valid] - half,
+            ys[valid] + half,
+            cmap(norm(heat[valid])),
+        )
+        cells[valid, j] = [f"{round(v, 2)}%" for v in heat[valid]]
+
+    if trend_col in res.columns:
+        j = res.columns.get_loc(trend_col)
+        slopes = values[:, j]
+        drawn = ~np.isnan(slopes) & ~res.index.isin(no_trend)
+        cells[~np.isnan(slopes), j] = ""
+        dx = 0.04
+        dy = 0.02 * slopes[drawn]
+        arrowColors = np.array(["#e76f51", "#e7c451", "#588157"])
+        add_arrow_batch(
+            ax,
+            np.full(drawn.sum(), colPositions[j] - dx / 2),
+            ys[drawn] - dy / 2,
+            np.full(drawn.sum(), dx),
+            dy,
+            arrowColors[(np.sign(dy) + 1).astype(int)],
+        )
+
+    add_text_batch(
+        ax,
+        np.tile(colPositions, nRows),
+        np.repeat(ys, nCols),
+        cells.ravel().tolist(),
+        fontsize=fontsize,
+    )
+    add_text_batch(
+        ax,
+        np.full(nRows, 0.06),
+        ys,
+        [str(team) for team in res.index],
+        fontsize=fontsize,
+        fontweight="bold",
+        ha="left",
+    )
+    # Headers stay real Text artists: there are only a handful and they set
+    # the top edge of the tight bounding box at savefig time.
+    for x, col in zip(colPositions, res.columns):
+        ax.text(
+            x,
+            top + 0.05,
+            header_mappings[col],
+            ha="center",
+            va="center",
+            fontsize=fontsize,
+            fontweight="bold",
+        )
+
+    if team_to_fotmob_id:
+        for team, y in zip(res.index, ys):
+            teamImage = OffsetImage(
+                fetch_logo(FOTMOB_TEAM_LOGO_URL.format(team_to_fotmob_id[team])),
+                zoom=0.08,
+                resample=True,
+            )
+            ax.add_artist(
+                AnnotationBbox(
+                    teamImage, (0.02, y), frameon=False, box_alignment=(0.5, 0.5)
+                )
+            )
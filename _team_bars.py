@@ -0,0 +1,200 @@
+"""
+Player bar charts of one metric per team (goals minus xG, assists minus
+xA...), rendered for a few teams or for a whole league in one batch.
+
+The league table is grouped by team once; every team's chart is drawn from
+that shared in-memory frame, either in this process or across a worker pool.
+Matplotlib and the worker pool are only imported once a chart is actually
+drawn, so a batch whose images are all up to date never loads them.
+"""
+
+import math
+import os
+import numpy as np
+import pandas as pd
+
+from _render_cache import visual_fingerprint, is_up_to_date, record_render
+from _teams import FOTMOB_TEAM_LOGO_URL
+
+BAR_COLORS = ["#C2B7B7", "#288ece"]
+FACECOLOR = "#eeeeee"
+FONT_FAMILY = "Monospace"
+
+
+def team_frames(df, metric, base_col, teams=None, top=None):
+    """
+    Split a league-wide player frame into one frame per team, best `metric`
+    first. Players with no `base_col` (e.g. zero xG) are left out; `top`
+    keeps only the `top` players by `base_col`.
+    """
+    df = df[df[base_col] != 0]
+    if teams is not None:
+        df = df[df["team"].isin(teams)]
+
+    frames = {}
+    for team, frame in df.groupby("team", sort=False):
+        if top:
+            frame = frame.nlargest(top, base_col)
+        frames[team] = frame.sort_values(metric, ascending=False).reset_index(drop=True)
+    return frames
+
+
+def draw_team_bar(
+    df, metric, xlabel, min_bound=4, fontsize=10, logo_url=None, logo_x=0.485
+):
+    """
+    Horizontal bars of `metric`, one per player, labelled on the side of the
+    zero line opposite to the bar. The x range is symmetric and at least
+    `min_bound` wide on each side.
+    """
+    from matplotlib.colors import LinearSegmentedColormap, Normalize
+    from _commons import fetch_logo, render_dpi, stroke_effects, templated_figure
+
+    # Every team's chart shares the figure template; only the data is drawn.
+    fig, ax = templated_figure((7, 9), render_dpi(600), facecolor=FACECOLOR)
+    ax.set_xlabel(xlabel, labelpad=10)
+
+    values = df[metric].to_numpy()
+    cmap = LinearSegmentedColormap.from_list("custom_gradient", BAR_COLORS)
+    norm = Normalize(vmin=values.min(), vmax=values.max())
+    ax.barh(df.index, values, zorder=3, color=cmap(norm(values)))
+
+    effects = stroke_effects(1, "white")
+    for i, (player, val) in enumerate(zip(df["player"], values)):
+        ax.text(
+            0.2 if val > 0 else -0.2,
+            i,
+            f"{player}",
+            va="center",
+            ha="left" if val > 0 else "right",
+            fontsize=fontsize,
+            zorder=4,
+            fontweight="bold",
+            path_effects=effects,
+        )
+
+    bound = max(min_bound, math.ceil(np.abs(values).max()))
+    ax.spines["left"].set_position(("data", 0))
+    ax.set_xticks(range(-bound, bound + 1, 1))
+    ax.set_yticks([])
+
+    if logo_url:
+        logo_ax = fig.add_axes([logo_x, 0.9, 0.06, 0.06], anchor="C")
+        logo_ax.imshow(fetch_logo(logo_url))
+        logo_ax.axis("off")
+    return fig
+
+
+def _fingerprint(frame, team, metric, drawKwargs):
+    return visual_fingerprint(
+        frame, params={"team": team, "metric": metric, **drawKwargs}
+    )
+
+
+def render_team_bar(frame, team, output_path, metric, inputs=None, **drawKwargs):
+    """
+    Draw and save one team's chart, unless the saved image is up to date.
+    """
+    fingerprint = _fingerprint(frame, team, metric, drawKwargs)
+    if is_up_to_date(output_path, fingerprint):
+        print(f"{output_path} is up to date, skipping render")
+        return
+
+    import matplotlib.pyplot as plt
+
+    plt.rcParams["font.family"] = FONT_FAMILY
+    fig = draw_team_bar(frame, metric, **drawKwargs)
+    # The template fixes the layout: no tight bbox, so the cached background
+    # is copied rather than resampled.
+    fig.savefig(output_path, facecolor=FACECOLOR, edgecolor="none", transparent=False)
+    plt.close(fig)
+    record_render(output_path, fingerprint, inputs=inputs)
+
+
+def _render_shared_team(team, **kwargs):
+    # Worker side of `render_team_bars`: the frames arrive once per worker.
+    from _render_farm import get_shared
+
+    frame = get_shared("team_frames")
+    frame = frame[frame["team"] == team].reset_index(drop=True)
+    render_team_bar(frame, team, **kwargs)
+
+
+def _slug(team):
+    return "".join(c if c.isalnum() else "_" for c in team.lower()).strip("_")
+
+
+def render_team_bars(
+    df,
+    metric,
+    base_col,
+    output_template,
+    teams=None,
+    top=None,
+    team_to_fotmob_id=None,
+    processes=0,
+    inputs=None,
+    **drawKwargs,
+):
+    """
+    Render `metric` bars for every team in `df` (or only `teams`). Output
+    paths come from `output_template`, formatted with the team's slug.
+
+    Logos are looked up in `team_to_fotmob_id`. With `processes` set, teams
+    are spread over that many workers (``None`` for one per CPU); the default
+    0 renders them one after another in this process. In both modes a
+    failing team raises; in parallel, once every team has been tried.
+    """
+    frames = team_frames(df, metric, base_col, teams, top)
+    team_to_fotmob_id = team_to_fotmob_id or {}
+    jobs = {}
+    for team in frames:
+        fotmobId = team_to_fotmob_id.get(team)
+        output_path = output_template.format(team=_slug(team))
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        jobs[team] = dict(
+            output_path=output_path,
+            metric=metric,
+            inputs=inputs,
+            logo_url=FOTMOB_TEAM_LOGO_URL.format(fotmobId) if fotmobId else None,
+            **drawKwargs,
+        )
+
+    if not jobs:
+        return
+    if processes == 0:
+        for team, kwargs in jobs.items():
+            render_team_bar(frames[team], team, **kwargs)
+        return
+
+    # Skip up-to-date teams here: a batch with nothing to draw starts no pool.
+    for team, kwargs in list(jobs.items()):
+        teamKwargs = {"logo_url": kwargs["logo_url"], **drawKwargs}
+        fingerprint = _fingerprint(frames[team], team, metric, teamKwargs)
+        if is_up_to_date(kwargs["output_path"], fingerprint):
+            print(f"{kwargs['output_path']} is up to date, skipping render")
+            del jobs[team]
+    if not jobs:
+        return
+
+    from _render_farm import render_jobs
+
+    results = render_jobs(
+        [
+            (_render_shared_team, dict(team=team, **kwargs))
+            for team, kwargs in jobs.items()
+        ],
+        shared={"team_frames": pd.concat(frames.values(), ignore_index=True)},
+        logo_urls=[
+            kwargs["logo_url"] for kwargs in jobs.values() if kwargs["logo_url"]
+        ],
+        processes=processes,
+    )
+    # Fail like the in-process path does, after every team had its turn.
+    failed = [
+        f"{team}: {error}"
+        for team, (_, _, error) in zip(jobs, results)
+        if error is not None
+    ]
+    if failed:
+        raise RuntimeError(f"{len(failed)} team charts failed:\n" + "\n".join(failed))
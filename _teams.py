@@ -0,0 +1,135 @@
+"""
+Team identity registry: FBref names and aliases mapped to stable integer ids
+and fotmob ids, for the leagues the visuals cover. A league's block lists the
+teams its visuals draw so far (a single club for MLS), so league-wide batches
+render the registered teams only; teams are appended as visuals need them.
+
+Ids never change once assigned; each league has its own block of 100 so new
+teams can be appended without renumbering. Frames can store teams as these
+small integer codes (`encode_teams`) and join on them instead of on names.
+"""
+
+import pandas as pd
+
+FOTMOB_TEAM_LOGO_URL = "https://images.fotmob.com/image_resources/logo/teamlogo/{}.png"
+FOTMOB_LEAGUE_LOGO_URL = (
+    "https://images.fotmob.com/image_resources/logo/leaguelogo/{}.png"
+)
+
+LEAGUE_FOTMOB_IDS = {
+    "ENG-Premier League": 47,
+    "ESP-La Liga": 87,
+    "ITA-Serie B": 86,
+}
+
+# team_id, league, FBref name, fotmob id, other spellings
+_TEAMS = [
+    (100, "GER-Bundesliga", "Augsburg", 8406, ["FC Augsburg"]),
+    (101, "GER-Bundesliga", "Leverkusen", 8178, ["Bayer Leverkusen"]),
+    (102, "GER-Bundesliga", "Bayern Munich", 9823, ["Bayern München"]),
+    (103, "GER-Bundesliga", "Dortmund", 9789, ["Borussia Dortmund"]),
+    (104, "GER-Bundesliga", "Gladbach", 9788, ["Mönchengladbach"]),
+    (105, "GER-Bundesliga", "Eint Frankfurt", 9810, ["Eintracht Frankfurt"]),
+    (106, "GER-Bundesliga", "Heidenheim", 94937, ["1. FC Heidenheim"]),
+    (107, "GER-Bundesliga", "Köln", 8722, ["1. FC Köln", "Koln"]),
+    (108, "GER-Bundesliga", "Freiburg", 8358, ["SC Freiburg"]),
+    (109, "GER-Bundesliga", "Hamburger SV", 9790, ["Hamburg"]),
+    (110, "GER-Bundesliga", "Hoffenheim", 8226, ["TSG Hoffenheim"]),
+    (111, "GER-Bundesliga", "Mainz 05", 9905, ["Mainz"]),
+    (112, "GER-Bundesliga", "RB Leipzig", 178475, ["Leipzig"]),
+    (113, "GER-Bundesliga", "St. Pauli", 8152, ["FC St. Pauli"]),
+    (114, "GER-Bundesliga", "Union Berlin", 8149, ["1. FC Union Berlin"]),
+    (115, "GER-Bundesliga", "Stuttgart", 10269, ["VfB Stuttgart"]),
+    (116, "GER-Bundesliga", "Werder Bremen", 8697, ["Bremen"]),
+    (117, "GER-Bundesliga", "Wolfsburg", 8721, ["VfL Wolfsburg"]),
+    (200, "BEL-Belgian Pro League", "Antwerp", 9988, ["Royal Antwerp"]),
+    (201, "BEL-Belgian Pro League", "Dender", 7947, ["Dender EH"]),
+    (202, "BEL-Belgian Pro League", "La Louvière", 1218969, ["RAAL La Louvière"]),
+    (203, "BEL-Belgian Pro League", "Zulte Waregem", 10000, []),
+    (204, "BEL-Belgian Pro League", "Anderlecht", 8635, []),
+    (205, "BEL-Belgian Pro League", "Club Brugge", 8342, []),
+    (206, "BEL-Belgian Pro League", "OH Leuven", 1773, ["Oud-Heverlee Leuven"]),
+    (207, "BEL-Belgian Pro League", "Sint-Truiden", 9997, ["Sint-Truidense"]),
+    (208, "BEL-Belgian Pro League", "Mechelen", 8203, ["KV Mechelen"]),
+    (209, "BEL-Belgian Pro League", "Gent", 9991, ["KAA Gent"]),
+    (210, "BEL-Belgian Pro League", "Standard Liège", 9985, ["Standard Liege"]),
+    (211, "BEL-Belgian Pro League", "Westerlo", 10001, []),
+    (212, "BEL-Belgian Pro League", "Cercle Brugge", 9984, []),
+    (213, "BEL-Belgian Pro League", "Charleroi", 9986, []),
+    (214, "BEL-Belgian Pro League", "Genk", 9987, ["Racing Genk"]),
+    (215, "BEL-Belgian Pro League", "Union SG", 7978, ["Union Saint-Gilloise"]),
+    (300, "USA-Major League Soccer", "Charlotte", 1323940, ["Charlotte FC"]),
+    (400, "ENG-Premier League", "Aston Villa", 10252, []),
+]
+
+TEAMS = pd.DataFrame(
+    [row[:4] for row in _TEAMS], columns=["team_id", "league", "team", "fotmob_id"]
+).astype({"team_id": "int16", "league": "category", "fotmob_id": "int32"})
+TEAMS = TEAMS.set_index("team_id")
+
+_NAME_TO_ID = {}
+for teamId, _, name, _, aliases in _TEAMS:
+    for spelling in [name] + aliases:
+        _NAME_TO_ID[spelling] = teamId
+        _NAME_TO_ID[spelling.casefold()] = teamId
+
+
+def team_id(name):
+    """
+    Integer id of a team from its FBref name or any known alias.
+    """
+    try:
+        return (
+            _NAME_TO_ID[name] if name in _NAME_TO_ID else _NAME_TO_ID[name.casefold()]
+        )
+    except KeyError:
+        raise KeyError(f"Unknown team {name!r}, add it to _teams._TEAMS") from None
+
+
+def team_name(teamId):
+    return TEAMS.at[teamId, "team"]
+
+
+def league_team_ids(league):
+    """
+    Ids of the registered teams of `league`.
+    """
+    return TEAMS.index[TEAMS["league"] == league]
+
+
+def league_fotmob_ids(league):
+    """
+    FBref name to fotmob id for every registered team of `league`.
+    """
+    teams = TEAMS[TEAMS["league"] == league]
+    return dict(zip(teams["team"], teams["fotmob_id"]))
+
+
+def team_logo_url(team):
+    """
+    Fotmob logo of a team, given its id or any of its names.
+    """
+    teamId = team_id(team) if isinstance(team, str) else team
+    return FOTMOB_TEAM_LOGO_URL.format(TEAMS.at[teamId, "fotmob_id"])
+
+
+def league_logo_url(league):
+    return FOTMOB_LEAGUE_LOGO_URL.format(LEAGUE_FOTMOB_IDS[league])
+
+
+def encode_teams(df, columns=("team", "opponent")):
+    """
+    Replace team names in `columns` with their int16 ids. Teams missing from
+    the registry become <NA>, so they drop out of groupbys and joins.
+    """
+    df = df.copy()
+    for column in columns:
+        df[column] = df[column].map(_NAME_TO_ID).astype("Int16")
+    return df
+
+
+def decode_teams(ids):
+    """
+    FBref names for an array or index of team ids.
+    """
+    return TEAMS["team"].reindex(ids).to_numpy()
@@ -0,0 +1,195 @@
+"""
+Venue analytics over the stored schedules of every league and season.
+
+Usage:
+    python _venues.py
+    python _venues.py --leagues "ENG-Premier League" --seasons 2425 --top 20
+
+Per venue: matches, goals, xG and attendance, totals and per game, in a
+single grouped pass over all the schedules asked for, so a cross-league
+ranking is one sort. Which stadium a team plays at comes from its venue
+history: the spells of consecutive home matches at the same venue, which
+keeps moves, temporary grounds and returns apart instead of taking the
+last venue seen. Rankings carry the points per game the home teams took at
+each venue, from the matches played there, next to those teams' whole home
+record from the aggregate cube (see `_cube`): a venue that is a fortress
+stands out against its teams' record elsewhere.
+"""
+
+import argparse
+import pandas as pd
+
+from _cube import read_cube
+from _fbref_commons import separate_score
+from _store import STORE_FOLDER, read_table
+
+VENUE_COLUMNS = [
+    "league",
+    "season",
+    "date",
+    "home_team",
+    "venue",
+    "score",
+    "home_xg",
+    "away_xg",
+    "attendance",
+]
+
+
+def _numeric(df, column):
+    if column not in df:
+        return pd.Series(float("nan"), index=df.index)
+    return pd.to_numeric(df[column], errors="coerce")
+
+
+def _dates(df):
+    if "date" not in df:
+        return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+    return pd.to_datetime(df["date"], errors="coerce")
+
+
+def venue_matches(schedule):
+    """
+    One row per played match with a venue: its goals, the home team's points,
+    xG and attendance.
+    """
+    if "venue" not in schedule:
+        schedule = schedule.assign(venue=None)
+    df = schedule[schedule["venue"].notna() & schedule["score"].notna()]
+    df = df[[c for c in VENUE_COLUMNS if c in df]].copy()
+    for column in ("league", "season", "home_team", "venue"):
+        df[column] = df[column].astype(str)
+    homeGoals, awayGoals = separate_score(df["score"].astype(str))
+    df["goals"] = homeGoals + awayGoals
+    df["home_points"] = 3 * (homeGoals > awayGoals) + (homeGoals == awayGoals)
+    df["xg"] = _numeric(df, "home_xg") + _numeric(df, "away_xg")
+    df["attendance"] = _numeric(df, "attendance")
+    df["date"] = _dates(df)
+    return df.drop(columns=["score", "home_xg", "away_xg"], errors="ignore")
+
+
+def venue_stats(matches, keys=("league", "venue")):
+    """
+    Totals and per-game rates of `venue_matches` rows grouped by `keys`.
+    """
+    stats = (
+        matches.groupby(list(keys), observed=True)
+        .agg(
+            matches=("goals", "size"),
+            goals=("goals", "sum"),
+            home_ppg=("home_points", "mean"),
+            xg=("xg", "sum"),
+            xg_matches=("xg", "count"),
+            attendance_mean=("attendance", "mean"),
+            seasons=("season", "nunique"),
+            first_season=("season", "min"),
+            last_season=("season", "max"),
+        )
+        .reset_index()
+    )
+    stats["goals_per_game"] = stats["goals"] / stats["matches"]
+    stats["xg_per_game"] = stats["xg"] / stats["xg_matches"]
+    return stats
+
+
+def venue_history(matches):
+    """
+    Spells of each home team: consecutive home matches at the same venue,
+    with their first and last date and match count, oldest first.
+    """
+    # By team, not league: promotions and relegations do not end a spell.
+    df = matches.sort_values(["home_team", "date"], kind="stable")
+    moved = (df["venue"] != df["venue"].shift()) | (
+        df["home_team"] != df["home_team"].shift()
+    )
+    return (
+        df.assign(spell=moved.cumsum())
+        .groupby("spell")
+        .agg(
+            league=("league", "last"),
+            team=("home_team", "first"),
+            venue=("venue", "first"),
+            first_date=("date", "min"),
+            last_date=("date", "max"),
+            first_season=("season", "min"),
+            last_season=("season", "max"),
+            matches=("goals", "size"),
+        )
+        .reset_index(drop=True)
+    )
+
+
+def current_venues(history):
+    """
+    `{team: venue}` of each team's latest spell.
+    """
+    latest = history.sort_values("last_date").groupby("team").tail(1)
+    return dict(zip(latest["team"], latest["venue"]))
+
+
+def venue_ranking(matches, cube=None, min_matches=10):
+    """
+    Venues with at least `min_matches` matches, most goals per game first,
+    with the teams that played home matches there and the points per game
+    they took there (`home_ppg`). Given the cube, `team_home_ppg` is the
+    same teams' home record over those seasons, at any venue.
+    """
+    ranking = venue_stats(matches)
+    teams = (
+        matches.groupby(["league", "venue"])["home_team"]
+        .unique()
+        .map(lambda names: ", ".join(sorted(names)))
+        .rename("teams")
+    )
+    ranking = ranking.join(teams, on=["league", "venue"])
+
+    if cube is not None:
+        home = cube[cube["side"] == "home"].astype(
+            {"league": str, "season": str, "team": str}
+        )
+        played = matches[["league", "season", "home_team", "venue"]].drop_duplicates()
+        record = played.merge(
+            home,
+            left_on=["league", "season", "home_team"],
+            right_on=["league", "season", "team"],
+        )
+        record = record.groupby(["league", "venue"])[["points", "matches"]].sum()
+        ranking = ranking.join(
+            (record["points"] / record["matches"]).rename("team_home_ppg"),
+            on=["league", "venue"],
+        )
+
+    ranking = ranking[ranking["matches"] >= min_matches]
+    return ranking.sort_values("goals_per_game", ascending=False).reset_index(drop=True)
+
+
+def stored_venue_ranking(
+    leagues=None, seasons=None, min_matches=10, folder=STORE_FOLDER
+):
+    """
+    `venue_ranking` of the stored schedules and cube of `leagues` and
+    `seasons` (all when None).
+    """
+    schedule = read_table(
+        "schedule", leagues, seasons, columns=VENUE_COLUMNS, folder=folder
+    )
+    cube = read_cube(leagues, seasons, side="home", folder=folder)
+    return venue_ranking(venue_matches(schedule), cube, min_matches)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--store", default=STORE_FOLDER)
+    parser.add_argument("--leagues", nargs="+", default=None)
+    parser.add_argument("--seasons", nargs="+", default=None)
+    parser.add_argument("--min-matches", type=int, default=10)
+    parser.add_argument("--top", type=int, default=30)
+    args = parser.parse_args()
+
+    ranking = stored_venue_ranking(
+        args.leagues, args.seasons, args.min_matches, args.store
+    )
+    columns = ["league", "venue", "teams", "matches", "goals_per_game"]
+    columns += ["xg_per_game", "attendance_mean", "home_ppg", "team_home_ppg"]
+    with pd.option_context("display.width", 200, "display.max_colwidth", 40):
+        print(ranking[columns].head(args.top).round(2).to_string(index=False))